@@ -1,23 +1,43 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, Response, stream_with_context, stream_template, make_response
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from alembic import command as alembic_command
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from sqlalchemy import event, func
+from sqlalchemy.orm import joinedload, selectinload
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from functools import partial, wraps
+from urllib.parse import urlencode
+import csv
+import io
 import os
 import uuid
 import json
+import threading
+import time
+from types import SimpleNamespace
+
+import click
+
+from nft_indexer import JsonRpcClient, scan
+from schedule import EventSchedule
+from similarity import TfidfIndex
+from singleflight import SingleFlight
+from trending import TrendingRanking
+from typeahead import PrefixIndex
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///innovators.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///innovators.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
 db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
 CORS(app)
 
 # Ensure upload directory exists
@@ -46,6 +66,9 @@ class Solution(db.Model):
     views = db.Column(db.Integer, default=0)
     purchases = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    creator = db.relationship('User')
     
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -62,6 +85,11 @@ class Job(db.Model):
     employer_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     applications = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    employer = db.relationship('User')
+    # Archived rows keep their id, so SQLite must never hand it out again.
+    __table_args__ = {'sqlite_autoincrement': True}
     
 class Course(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -76,6 +104,7 @@ class Course(db.Model):
     students = db.Column(db.Integer, default=0)
     featured = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
 class Event(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -90,6 +119,11 @@ class Event(db.Model):
     speaker = db.Column(db.String(100))
     agenda = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    registrations = db.relationship('Registration', back_populates='event')
+    # Archived rows keep their id, so SQLite must never hand it out again.
+    __table_args__ = {'sqlite_autoincrement': True}
     
 class PitchApplication(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -113,8 +147,1227 @@ class Registration(db.Model):
     registration_type = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    event = db.relationship('Event', back_populates='registrations')
+    user = db.relationship('User')
+    # Archived rows keep their id, so SQLite must never hand it out again.
+    __table_args__ = {'sqlite_autoincrement': True}
+
+class JobLocation(db.Model):
+    """Normalized location tokens for a job, kept in sync with Job.location."""
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)  # city, region, country, remote
+    token = db.Column(db.String(100), nullable=False)
+    __table_args__ = (db.Index('ix_job_location_token_job', 'token', 'job_id'),)
+
+# Archive tables: past events (with their registrations) and expired jobs are
+# moved here by `flask archive-stale` so the hot tables only hold live rows.
+class EventArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    event_type = db.Column(db.String(50), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    date = db.Column(db.DateTime, nullable=False, index=True)
+    location = db.Column(db.String(200))
+    capacity = db.Column(db.Integer)
+    registered = db.Column(db.Integer)
+    price = db.Column(db.Float)
+    speaker = db.Column(db.String(100))
+    agenda = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+class RegistrationArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    event_id = db.Column(db.Integer, index=True)
+    user_id = db.Column(db.Integer, index=True)
+    registration_type = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+class JobArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    company = db.Column(db.String(100), nullable=False)
+    location = db.Column(db.String(100), nullable=False)
+    job_type = db.Column(db.String(50), nullable=False)
+    salary_range = db.Column(db.String(100))
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text)
+    benefits = db.Column(db.Text)
+    remote = db.Column(db.Boolean)
+    featured = db.Column(db.Boolean)
+    employer_id = db.Column(db.Integer, index=True)
+    applications = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, index=True)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    employer = db.relationship('User', primaryjoin='foreign(JobArchive.employer_id) == User.id', viewonly=True)
+
+class EngagementEvent(db.Model):
+    """Append-only log of solution views and purchases, drained into rollups."""
+    id = db.Column(db.Integer, primary_key=True)
+    solution_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # view, purchase
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class SolutionHourlyStats(db.Model):
+    solution_id = db.Column(db.Integer, primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    purchases = db.Column(db.Integer, nullable=False, default=0)
+
+class SolutionDailyStats(db.Model):
+    solution_id = db.Column(db.Integer, primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    purchases = db.Column(db.Integer, nullable=False, default=0)
+
+class NftToken(db.Model):
+    """On-chain state of a SolutionsMarketplace token, as seen by the indexer."""
+    token_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    solution_id = db.Column(db.Integer, db.ForeignKey('solution.id'), index=True)
+    creator_address = db.Column(db.String(42))
+    owner_address = db.Column(db.String(42))
+    purchases = db.Column(db.Integer, nullable=False, default=0)
+    minted_block = db.Column(db.Integer)
+
+class IndexerCheckpoint(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    block_number = db.Column(db.Integer, nullable=False)
+
+class Tombstone(db.Model):
+    """Records deleted Solution/Job/Course/Event ids for the ?since= change feed."""
+    id = db.Column(db.Integer, primary_key=True)
+    resource = db.Column(db.String(20), nullable=False)
+    item_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (db.Index('ix_tombstone_resource_deleted', 'resource', 'deleted_at'),)
+
+class CacheVersion(db.Model):
+    """Write counter per in-process cache, compared by every process to spot remote writes."""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+for _model in (Solution, Job, Course, Event):
+    db.Index(f'ix_{_model.__tablename__}_updated_at_id', _model.updated_at, _model.id)
+
+def record_tombstones(connection, model, ids, deleted_at=None):
+    deleted_at = deleted_at or datetime.utcnow()
+    if ids:
+        connection.execute(Tombstone.__table__.insert(), [
+            {'resource': model.__tablename__, 'item_id': i, 'deleted_at': deleted_at} for i in ids
+        ])
+
+@event.listens_for(Solution, 'after_delete')
+@event.listens_for(Job, 'after_delete')
+@event.listens_for(Course, 'after_delete')
+@event.listens_for(Event, 'after_delete')
+def _record_tombstone(mapper, connection, obj):
+    record_tombstones(connection, type(obj), [obj.id])
+
+# Job location index
+def normalize_location(text):
+    return ' '.join(''.join(ch if ch.isalnum() else ' ' for ch in (text or '').casefold()).split())
+
+def location_tokens(location, remote=False):
+    """Parse "City, Region, Country" into ``(kind, token)`` pairs."""
+    parts = [p for p in (normalize_location(part) for part in (location or '').split(',')) if p]
+    tokens = set()
+    if remote or 'remote' in parts:
+        tokens.add(('remote', 'remote'))
+    parts = [p for p in parts if p != 'remote']
+    for i, part in enumerate(parts):
+        if i == 0:
+            kind = 'city'
+        elif i == len(parts) - 1:
+            kind = 'country'
+        else:
+            kind = 'region'
+        tokens.add((kind, part))
+    return tokens
+
+def job_location_clause(query):
+    """Match jobs having every location token in ``query``, each as a token prefix.
+
+    Prefixes are matched as an index range scan on (token, job_id), so "nair"
+    finds "Nairobi, Kenya" without a leading-wildcard LIKE.
+    """
+    clauses = []
+    for _, token in location_tokens(query):
+        clauses.append(Job.id.in_(db.select(JobLocation.job_id).where(
+            JobLocation.token >= token,
+            JobLocation.token < token + '\uffff'
+        )))
+    return db.and_(*clauses)
+
+def _insert_job_locations(connection, job):
+    rows = [{'job_id': job.id, 'kind': kind, 'token': token}
+            for kind, token in location_tokens(job.location, job.remote)]
+    if rows:
+        connection.execute(JobLocation.__table__.insert(), rows)
+
+@event.listens_for(Job, 'after_insert')
+def _index_job_location(mapper, connection, job):
+    _insert_job_locations(connection, job)
+
+@event.listens_for(Job, 'after_update')
+def _reindex_job_location(mapper, connection, job):
+    state = db.inspect(job)
+    if state.attrs.location.history.has_changes() or state.attrs.remote.history.has_changes():
+        connection.execute(JobLocation.__table__.delete().where(JobLocation.job_id == job.id))
+        _insert_job_locations(connection, job)
+
+@event.listens_for(Job, 'before_delete')
+def _unindex_job_location(mapper, connection, job):
+    connection.execute(JobLocation.__table__.delete().where(JobLocation.job_id == job.id))
+
+@app.cli.command('index-job-locations')
+def index_job_locations():
+    """Rebuild the job location index from Job.location."""
+    db.session.execute(JobLocation.__table__.delete())
+    rows = []
+    for job_id, location, remote in db.session.query(Job.id, Job.location, Job.remote).yield_per(1000):
+        rows.extend({'job_id': job_id, 'kind': kind, 'token': token}
+                    for kind, token in location_tokens(location, remote))
+        if len(rows) >= 5000:
+            db.session.execute(JobLocation.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(JobLocation.__table__.insert(), rows)
+    db.session.commit()
+    print(f'Indexed {JobLocation.query.count()} location tokens')
+
+# Post-commit write hooks
+_commit_hooks = defaultdict(list)
+
+def on_commit(*models):
+    """Register ``fn(model, changes)`` to run after a commit that wrote any of ``models``.
+
+    ``changes`` is a list of ``(kind, row)`` tuples where kind is 'insert',
+    'update' or 'delete' and row is a dict of the column values at flush time.
+    Update rows also carry ``'_changed'``, the set of modified column keys.
+    """
+    def decorator(fn):
+        for model in models:
+            _commit_hooks[model].append(fn)
+        return fn
+    return decorator
+
+def _row_snapshot(obj):
+    columns = obj.__mapper__.column_attrs
+    return {c.key: obj.__dict__.get(c.key) for c in columns}
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_writes(session, flush_context):
+    written = session.info.setdefault('written', defaultdict(list))
+    for kind, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            if type(obj) in _commit_hooks:
+                row = _row_snapshot(obj)
+                if kind == 'update':
+                    attrs = db.inspect(obj).attrs
+                    row['_changed'] = {k for k in row if attrs[k].history.has_changes()}
+                written[type(obj)].append((kind, row))
+
+def touches(changes, columns):
+    """True if ``changes`` insert or delete rows, or update any of ``columns``."""
+    return any(kind != 'update' or row['_changed'] & columns for kind, row in changes)
+
+def notify_writes(model, changes):
+    """Run the commit hooks for ``model``; for bulk writes that bypass the ORM."""
+    for fn in _commit_hooks[model]:
+        fn(model, changes)
+    _flush_published()
+
+@event.listens_for(db.session, 'after_commit')
+def _dispatch_writes(session):
+    written = session.info.pop('written', None) or {}
+    for model, changes in written.items():
+        notify_writes(model, changes)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_writes(session):
+    session.info.pop('written', None)
+
+# Cross-process invalidation
+# Commit hooks only run in the process that wrote, but every gunicorn worker
+# (and each CLI command) has its own in-process caches. A hook that changes a
+# cache also publishes its name, which bumps that cache's CacheVersion row.
+# Each process reads the (tiny) version table at most once per
+# CACHE_SYNC_INTERVAL and resets its copy of any cache whose version moved.
+CACHE_SYNC_INTERVAL = 1.0
+
+_shared_caches = {}  # name -> fn() resetting this process's copy
+_seen_versions = {}  # name -> version this process has caught up with
+_published = threading.local()
+_last_sync = 0.0
+_sync_lock = threading.Lock()
+
+def shared_cache(name):
+    """Register ``fn()`` to reset this process's copy of cache ``name`` after a remote write."""
+    def decorator(fn):
+        _shared_caches[name] = fn
+        return fn
+    return decorator
+
+def publish(name):
+    """Tell other processes that cache ``name`` changed; sent once the current hooks finish."""
+    if not hasattr(_published, 'names'):
+        _published.names = set()
+    _published.names.add(name)
+
+def _flush_published():
+    names = getattr(_published, 'names', None)
+    if not names:
+        return
+    _published.names = set()
+    table = CacheVersion.__table__
+    with db.engine.begin() as connection:
+        connection.execute(table.update().where(table.c.name.in_(names)).values(version=table.c.version + 1))
+        versions = connection.execute(db.select(table.c.name, table.c.version).where(table.c.name.in_(names)))
+        for name, version in versions:
+            # This process already applied its own write; only skip the reset
+            # if nobody else bumped the version since our last sync.
+            if _seen_versions.get(name) == version - 1:
+                _seen_versions[name] = version
+
+def sync_shared_caches(force=False):
+    """Reset caches whose version another process bumped since this one last looked."""
+    global _last_sync
+    if not force and time.monotonic() - _last_sync < CACHE_SYNC_INTERVAL:
+        return
+    if not _sync_lock.acquire(blocking=force):
+        return
+    try:
+        _last_sync = time.monotonic()
+        table = CacheVersion.__table__
+        for name, version in db.session.execute(db.select(table.c.name, table.c.version)):
+            if _seen_versions.get(name) != version:
+                _seen_versions[name] = version
+                if name in _shared_caches:
+                    _shared_caches[name]()
+    finally:
+        _sync_lock.release()
+
+def _register_cache_versions():
+    table = CacheVersion.__table__
+    existing = set(db.session.scalars(db.select(table.c.name)))
+    missing = [{'name': name, 'version': 0} for name in _shared_caches if name not in existing]
+    if missing:
+        db.session.execute(table.insert(), missing)
+        db.session.commit()
+
+@app.before_request
+def _sync_caches():
+    sync_shared_caches()
+
+# Filters and facets
+# Each listing page maps a query-string parameter to the column it groups by
+# and the clause it filters with. Pages and the facets API share these specs.
+# A column from another table (job locations) is counted through a join.
+FACETS = {
+    'solutions': (Solution, {
+        'category': (Solution.category, lambda v: Solution.category == v),
+        'stage': (Solution.stage, lambda v: Solution.stage == v),
+        'funding': (Solution.funding_status, lambda v: Solution.funding_status == v),
+    }),
+    'hiring': (Job, {
+        'type': (Job.job_type, lambda v: Job.job_type == v),
+        'location': (JobLocation.token, job_location_clause),
+        'remote': (Job.remote, lambda v: Job.remote == (v != 'false')),
+    }),
+    'learn': (Course, {
+        'category': (Course.category, lambda v: Course.category == v),
+    }),
+}
+FACET_CACHE_SIZE = 256
+FACET_MAX_VALUES = 50
+
+_facet_cache = SingleFlight(max_entries=FACET_CACHE_SIZE)
+
+def filter_state(resource, args):
+    """Normalize request args into the active filters for a listing page."""
+    state = {}
+    for name in FACETS[resource][1]:
+        value = (args.get(name) or '').strip()
+        if value and value != 'all':
+            state[name] = value
+    return state
+
+def filter_clauses(resource, state, exclude=None):
+    dimensions = FACETS[resource][1]
+    return [dimensions[name][1](value) for name, value in state.items() if name != exclude]
+
+def _facet_key(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+def facet_counts(resource, state):
+    """Count matches per value of every facet, one grouped query per dimension.
+
+    Each dimension is counted with the filters of the *other* dimensions applied,
+    so the counts show what selecting a value would return, limited to the
+    FACET_MAX_VALUES most common values. Results are cached per normalized
+    filter state until the underlying model is written, and concurrent misses
+    for the same state share one set of queries.
+    """
+    key = (resource, tuple(sorted(state.items())))
+    return _facet_cache.get(key, lambda: _count_facets(resource, state))
+
+def _count_facets(resource, state):
+    model, dimensions = FACETS[resource]
+    counts = {}
+    for name, (column, _) in dimensions.items():
+        count = func.count(model.id.distinct())
+        query = db.session.query(column, count).select_from(model)
+        if column.class_ is not model:
+            query = query.join(column.class_)
+        rows = query.filter(
+            *filter_clauses(resource, state, exclude=name)
+        ).group_by(column).order_by(count.desc()).limit(FACET_MAX_VALUES).all()
+        counts[name] = {_facet_key(value): count for value, count in rows if value is not None}
+    return counts
+
+# Joined facet columns are derived from the model column of the same name.
+_faceted_columns = {
+    model: {column.key if column.class_ is model else name for name, (column, _) in dimensions.items()}
+    for model, dimensions in FACETS.values()
+}
+
+@on_commit(Solution, Job, Course)
+def _invalidate_facets(model, changes):
+    # View and purchase counters change constantly but are not faceted.
+    if touches(changes, _faceted_columns[model]):
+        _facet_cache.invalidate(lambda key: FACETS[key[0]][0] is model)
+        publish('facets')
+
+@shared_cache('facets')
+def _reset_facets():
+    _facet_cache.invalidate()
+
+# Typeahead suggestions
+# Maps each model to its result type, the detail column shown next to the
+# title, and the columns whose text is indexed.
+SUGGEST_SOURCES = {
+    Solution: ('solution', 'category', ('title',)),
+    Job: ('job', 'company', ('title', 'company')),
+    Course: ('course', 'instructor', ('title', 'instructor')),
+}
+SUGGEST_MAX_ENTRIES = 500000
+
+suggest_index = PrefixIndex(max_entries=SUGGEST_MAX_ENTRIES)
+_suggest_loaded = False
+_suggest_stale = False
+_suggest_lock = threading.Lock()
+
+def _suggest_item(model, row):
+    kind, detail, fields = SUGGEST_SOURCES[model]
+    return (kind, row['id'], row['title'], row[detail]), [row[f] for f in fields]
+
+def ensure_suggest_index():
+    """Build the suggestion index from the database on first use.
+
+    Once marked stale (a delete, an edited title, or a write in another
+    process) it is rebuilt by one request while the others keep reading the
+    old index.
+    """
+    global _suggest_loaded, _suggest_stale
+    if _suggest_loaded and not _suggest_stale:
+        return suggest_index
+    if not _suggest_lock.acquire(blocking=not _suggest_loaded):
+        return suggest_index
+    try:
+        if not _suggest_loaded or _suggest_stale:
+            _suggest_stale = False
+            items = []
+            for model, (_, detail, fields) in SUGGEST_SOURCES.items():
+                names = {'id', 'title', detail, *fields}
+                rows = db.session.query(*[getattr(model, n) for n in names]).order_by(
+                    model.created_at.desc()
+                )
+                items.extend(_suggest_item(model, row._asdict()) for row in rows)
+            suggest_index.load(items)
+            _suggest_loaded = True
+    finally:
+        _suggest_lock.release()
+    return suggest_index
+
+@on_commit(*SUGGEST_SOURCES)
+def _update_suggest_index(model, changes):
+    global _suggest_stale
+    _, detail, fields = SUGGEST_SOURCES[model]
+    if not touches(changes, {'title', detail, *fields}):
+        return
+    publish('suggest')
+    if not _suggest_loaded:
+        return
+    for kind, row in changes:
+        if kind == 'insert':
+            suggest_index.add(*_suggest_item(model, row))
+        else:
+            # The sorted array has no cheap removal; rebuild on next use.
+            _suggest_stale = True
+
+@shared_cache('suggest')
+def _reset_suggest_index():
+    global _suggest_stale
+    _suggest_stale = True
+
+# Upcoming events schedule
+def _load_upcoming_events():
+    events = Event.query.filter(Event.date > datetime.utcnow()).all()
+    return [SimpleNamespace(**_row_snapshot(e)) for e in events]
+
+event_schedule = EventSchedule(_load_upcoming_events)
+
+@on_commit(Event)
+def _invalidate_event_schedule(model, changes):
+    event_schedule.invalidate()
+    publish('schedule')
+
+@shared_cache('schedule')
+def _reset_event_schedule():
+    event_schedule.invalidate()
+
+# Trending solutions
+TRENDING_HALF_LIFE = 3 * 24 * 3600
+TRENDING_VIEW_WEIGHT = 1.0
+TRENDING_PURCHASE_WEIGHT = 10.0
+
+TRENDING_WINDOW = 10 * TRENDING_HALF_LIFE
+ENGAGEMENT_WEIGHTS = {'view': TRENDING_VIEW_WEIGHT, 'purchase': TRENDING_PURCHASE_WEIGHT}
+# Other processes' events are pulled from the engagement log every
+# TRENDING_SYNC_INTERVAL seconds, looking TRENDING_SYNC_LAG seconds back for
+# rows that committed after their created_at. compact_engagement() leaves
+# events younger than ENGAGEMENT_SETTLE in the log, so a pull only misses
+# events if the process sat idle for most of that; it then reseeds instead.
+TRENDING_SYNC_INTERVAL = 5
+TRENDING_SYNC_LAG = 60
+ENGAGEMENT_SETTLE = 10 * 60
+
+trending_solutions = TrendingRanking(half_life=TRENDING_HALF_LIFE)
+_trending_synced_at = None  # monotonic time of the last seed or pull
+_trending_pulled_until = None  # log time the last seed or pull covered
+_trending_seen = {}  # event id -> created_at, for logged events inside the lag window
+_trending_lock = threading.Lock()
+
+def _timestamp(moment):
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+def _trending_events(seen_since):
+    """Yield ``(solution_id, weight, at)`` engagement to seed the ranking from.
+
+    Logged events and their rollups carry timestamps: hourly buckets for the
+    last two days, daily ones back to TRENDING_WINDOW. Whatever the lifetime
+    counters hold beyond that (older or never logged) is dated at creation.
+    Logged events from ``seen_since`` on are marked seen so pulls skip them.
+    """
+    now = datetime.utcnow()
+    recent = bucket_start(now - timedelta(days=2), 'day')
+    window = bucket_start(now - timedelta(seconds=TRENDING_WINDOW), 'day')
+    logged = defaultdict(lambda: [0, 0])
+
+    def entry(solution_id, views, purchases, at):
+        logged[solution_id][0] += views
+        logged[solution_id][1] += purchases
+        return (solution_id, views * TRENDING_VIEW_WEIGHT + purchases * TRENDING_PURCHASE_WEIGHT, _timestamp(at))
+
+    for model, start, end in ((SolutionDailyStats, window, recent), (SolutionHourlyStats, recent, None)):
+        rows = db.session.query(model.solution_id, model.views, model.purchases, model.bucket_start).filter(
+            model.bucket_start >= start
+        )
+        if end is not None:
+            rows = rows.filter(model.bucket_start < end)
+        for solution_id, views, purchases, at in rows:
+            yield entry(solution_id, views, purchases, at)
+    for event_id, solution_id, kind, at in db.session.query(
+        EngagementEvent.id, EngagementEvent.solution_id, EngagementEvent.kind, EngagementEvent.created_at
+    ):
+        if at >= seen_since:
+            _trending_seen[event_id] = at
+        yield entry(solution_id, int(kind == 'view'), int(kind == 'purchase'), at)
+    for solution_id, views, purchases, created_at in db.session.query(
+        Solution.id, Solution.views, Solution.purchases, Solution.created_at
+    ):
+        views = max((views or 0) - logged[solution_id][0], 0)
+        purchases = max((purchases or 0) - logged[solution_id][1], 0)
+        yield entry(solution_id, views, purchases, created_at)
+
+def _record_trending_event(event_id, solution_id, kind, created_at):
+    # Callers hold _trending_lock, so an event is recorded once whether this
+    # process logged it or a pull found it.
+    if event_id not in _trending_seen:
+        _trending_seen[event_id] = created_at
+        trending_solutions.record(solution_id, ENGAGEMENT_WEIGHTS[kind], _timestamp(created_at))
+
+def _pull_trending(now):
+    since = _trending_pulled_until - timedelta(seconds=TRENDING_SYNC_LAG)
+    for row in db.session.query(
+        EngagementEvent.id, EngagementEvent.solution_id, EngagementEvent.kind, EngagementEvent.created_at
+    ).filter(EngagementEvent.created_at >= since):
+        _record_trending_event(*row)
+    cutoff = now - timedelta(seconds=TRENDING_SYNC_LAG)
+    for event_id in [i for i, at in _trending_seen.items() if at < cutoff]:
+        del _trending_seen[event_id]
+
+def ensure_trending():
+    """Seed the ranking from logged engagement on first use.
+
+    Views recorded by this process are added as they happen; other
+    processes' are pulled from the engagement log every TRENDING_SYNC_INTERVAL
+    seconds by one request while the rest read the current ranking.
+    """
+    global _trending_synced_at, _trending_pulled_until
+    if _trending_synced_at is not None and time.monotonic() - _trending_synced_at < TRENDING_SYNC_INTERVAL:
+        return trending_solutions
+    if not _trending_lock.acquire(blocking=_trending_synced_at is None):
+        return trending_solutions
+    try:
+        if _trending_synced_at is None or time.monotonic() - _trending_synced_at >= TRENDING_SYNC_INTERVAL:
+            now = datetime.utcnow()
+            if _trending_pulled_until is None or now - _trending_pulled_until > timedelta(
+                seconds=ENGAGEMENT_SETTLE - TRENDING_SYNC_LAG
+            ):
+                _trending_seen.clear()
+                trending_solutions.load(_trending_events(now - timedelta(seconds=TRENDING_SYNC_LAG)))
+            else:
+                _pull_trending(now)
+            _trending_pulled_until = now
+            _trending_synced_at = time.monotonic()
+    finally:
+        _trending_lock.release()
+    return trending_solutions
+
+def record_engagement(solution_id, kind):
+    """Log a view or purchase and add it to this process's trending ranking."""
+    event = EngagementEvent(solution_id=solution_id, kind=kind)
+    db.session.add(event)
+    db.session.flush()
+    logged = (event.id, solution_id, kind, event.created_at)
+    db.session.commit()
+    ensure_trending()
+    with _trending_lock:
+        _record_trending_event(*logged)
+
+@on_commit(Solution)
+def _discard_trending(model, changes):
+    for kind, row in changes:
+        if kind == 'delete':
+            trending_solutions.discard(row['id'])
+
+# Admin exports
+EXPORT_BATCH_SIZE = 1000
+
+def admin_required(view):
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        user_id = session.get('user_id')
+        user = db.session.get(User, user_id) if user_id else None
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        return view(*args, **kwargs)
+    return wrapped
+
+def _parse_date_arg(name):
+    """ISO 8601 query arg as a naive UTC datetime, matching the stored columns."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def _export_rows(stmt):
+    # yield_per keeps a bounded window of rows in memory instead of .all()
+    result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for row in result.mappings():
+        yield row
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def stream_export(stmt, filename, fmt):
+    """Stream the rows of ``stmt`` as CSV or NDJSON without materializing them."""
+    columns = [c.name for c in stmt.selected_columns]
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for i, row in enumerate(_export_rows(stmt), 1):
+            writer.writerow([row[c] for c in columns])
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def generate_ndjson():
+        for row in _export_rows(stmt):
+            yield json.dumps(dict(row), default=_json_default) + '\n'
+
+    if fmt == 'ndjson':
+        body, mimetype = generate_ndjson(), 'application/x-ndjson'
+    else:
+        body, mimetype = generate_csv(), 'text/csv'
+        fmt = 'csv'
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename={filename}.{fmt}'
+    })
+
+# Similar-item recommendations
+# Text columns fed into each model's TF-IDF index.
+SIMILARITY_SOURCES = {
+    Solution: ('title', 'category', 'description'),
+    Job: ('title', 'company', 'description', 'requirements'),
+    Course: ('title', 'category', 'description'),
+}
+SIMILARITY_DIR = os.path.join(app.instance_path, 'similarity')
+
+# Rows committed up to this many seconds after their updated_at still get
+# picked up by the next catch-up.
+SIMILARITY_SYNC_LAG = 60
+
+similarity_indexes = {model: TfidfIndex() for model in SIMILARITY_SOURCES}
+_similarity_synced = {}  # model -> utc time its index was last caught up to
+_similarity_stale = set()  # models another process has written since
+_similarity_lock = threading.Lock()
+
+def similarity_text(model, row):
+    return ' '.join(str(row[field] or '') for field in SIMILARITY_SOURCES[model])
+
+def _similarity_rows(model, ids=None):
+    columns = [model.id] + [getattr(model, f) for f in SIMILARITY_SOURCES[model]]
+    query = db.session.query(*columns)
+    if ids is not None:
+        query = query.filter(model.id.in_(ids))
+    for row in query.yield_per(1000):
+        yield row.id, similarity_text(model, row._asdict())
+
+def _catch_up_similarity(model, index, since, compare_ids=False):
+    """Re-add rows updated after ``since`` and drop ones deleted after it.
+
+    ``compare_ids`` also diffs every id against the table, for snapshots whose
+    tombstones may already have been pruned.
+    """
+    since -= timedelta(seconds=SIMILARITY_SYNC_LAG)
+    changed = set(db.session.scalars(db.select(model.id).where(model.updated_at >= since)))
+    if compare_ids:
+        current = set(db.session.scalars(db.select(model.id)))
+        deleted = [i for i in index.ids if i in index and i not in current]
+        changed |= {i for i in current if i not in index}
+    else:
+        deleted = db.session.scalars(db.select(Tombstone.item_id).where(
+            Tombstone.resource == model.__tablename__, Tombstone.deleted_at >= since
+        ))
+    for item_id in deleted:
+        index.remove(item_id)
+    changed = list(changed)
+    for start in range(0, len(changed), 500):
+        for item_id, text in _similarity_rows(model, changed[start:start + 500]):
+            index.add(item_id, text)
+
+def ensure_similarity(model):
+    """Load ``model``'s index from its snapshot (or the database) on first use.
+
+    A snapshot written by `flask build-similarity` is memory-mapped and then
+    caught up with rows written since it was taken. After another process
+    writes ``model``, one request catches the index up the same way while the
+    others keep querying it.
+    """
+    index = similarity_indexes[model]
+    if model in _similarity_synced and model not in _similarity_stale:
+        return index
+    if not _similarity_lock.acquire(blocking=model not in _similarity_synced):
+        return index
+    try:
+        now = datetime.utcnow()
+        if model not in _similarity_synced:
+            path = os.path.join(SIMILARITY_DIR, model.__tablename__)
+            meta = os.path.join(path, 'meta.json')
+            if os.path.exists(meta):
+                index.load(path)
+                taken = datetime.fromtimestamp(os.path.getmtime(meta), timezone.utc).replace(tzinfo=None)
+                _catch_up_similarity(model, index, taken, compare_ids=True)
+            else:
+                index.build(_similarity_rows(model))
+            _similarity_synced[model] = now
+        elif model in _similarity_stale:
+            _similarity_stale.discard(model)
+            _catch_up_similarity(model, index, _similarity_synced[model])
+            _similarity_synced[model] = now
+    finally:
+        _similarity_lock.release()
+    return index
+
+@on_commit(*SIMILARITY_SOURCES)
+def _update_similarity(model, changes):
+    if not touches(changes, set(SIMILARITY_SOURCES[model])):
+        return
+    publish(f'similarity:{model.__tablename__}')
+    if model not in _similarity_synced:
+        return
+    index = similarity_indexes[model]
+    for kind, row in changes:
+        if kind == 'delete':
+            index.remove(row['id'])
+        elif kind == 'insert' or row['_changed'] & set(SIMILARITY_SOURCES[model]):
+            index.add(row['id'], similarity_text(model, row))
+
+for _model in SIMILARITY_SOURCES:
+    shared_cache(f'similarity:{_model.__tablename__}')(partial(_similarity_stale.add, _model))
+
+@app.cli.command('build-similarity')
+def build_similarity():
+    """Refit the TF-IDF indexes and write memory-mappable snapshots."""
+    for model, index in similarity_indexes.items():
+        index.build(_similarity_rows(model))
+        index.save(os.path.join(SIMILARITY_DIR, model.__tablename__))
+        print(f'Indexed {len(index)} {model.__tablename__} rows')
+
+def similar_items(model, ranked):
+    """Fetch ``model`` rows for ``[(id, score)]`` in ranked order."""
+    rows = {r.id: r for r in model.query.filter(model.id.in_([i for i, _ in ranked]))}
+    return [(rows[i], score) for i, score in ranked if i in rows]
+
+# Engagement rollups
+# Granularity name -> (rollup model, bucket width, max buckets per query)
+ROLLUPS = {
+    'hour': (SolutionHourlyStats, timedelta(hours=1), 24 * 31),
+    'day': (SolutionDailyStats, timedelta(days=1), 366),
+}
+ROLLUP_BATCH_SIZE = 5000
+
+def bucket_start(moment, granularity):
+    if granularity == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def compact_engagement(batch_size=ROLLUP_BATCH_SIZE):
+    """Fold logged engagement events into the hourly and daily rollups.
+
+    Each batch deletes the events it consumed and increments the rollup rows
+    in a single transaction, so an event is counted exactly once even if the
+    aggregator is interrupted or two aggregators overlap. Events younger than ENGAGEMENT_SETTLE are left
+    for the trending pulls. Returns the number of events compacted.
+    """
+    compacted = 0
+    while True:
+        settled = datetime.utcnow() - timedelta(seconds=ENGAGEMENT_SETTLE)
+        events = db.session.query(
+            EngagementEvent.id, EngagementEvent.solution_id, EngagementEvent.kind, EngagementEvent.created_at
+        ).filter(EngagementEvent.created_at < settled).order_by(EngagementEvent.id).limit(batch_size).all()
+        if not events:
+            return compacted
+
+        # Delete exactly the ids read: with sequence-backed ids a lower id can
+        # commit after a higher one, and an id range would drop it uncounted.
+        # Deleting first also claims the batch: if an overlapping run already
+        # took some of these events, fold none of them and read again.
+        deleted = db.session.execute(EngagementEvent.__table__.delete().where(
+            EngagementEvent.id.in_([e.id for e in events])
+        )).rowcount
+        if deleted != len(events):
+            db.session.rollback()
+            continue
+
+        for granularity, (model, _, _) in ROLLUPS.items():
+            totals = defaultdict(lambda: [0, 0])
+            for e in events:
+                counts = totals[(e.solution_id, bucket_start(e.created_at, granularity))]
+                counts[0 if e.kind == 'view' else 1] += 1
+            starts = [start for _, start in totals]
+            existing = {(r.solution_id, r.bucket_start): r for r in model.query.filter(
+                model.solution_id.in_({solution_id for solution_id, _ in totals}),
+                model.bucket_start.between(min(starts), max(starts))
+            )}
+            for key, (views, purchases) in totals.items():
+                row = existing.get(key)
+                if row is None:
+                    db.session.add(model(solution_id=key[0], bucket_start=key[1], views=views, purchases=purchases))
+                else:
+                    row.views = model.views + views
+                    row.purchases = model.purchases + purchases
+
+        db.session.commit()
+        compacted += len(events)
+
+@app.cli.command('aggregate-engagement')
+@click.option('--interval', type=int, default=0, help='Keep running, compacting every N seconds.')
+def aggregate_engagement(interval):
+    """Compact the engagement log into hourly and daily rollups."""
+    while True:
+        count = compact_engagement()
+        print(f'Compacted {count} engagement events')
+        if not interval:
+            break
+        time.sleep(interval)
+
+# On-chain NFT reconciliation
+NFT_CHECKPOINT = 'solutions-marketplace'
+
+def apply_nft_events(events, batch_end):
+    """Apply one block range of decoded marketplace events and advance the checkpoint.
+
+    Minted tokens are linked to the oldest unlinked Solution with the same
+    title. Token ids and on-chain purchase counts are then written to Solution
+    with one bulk UPDATE, in the same transaction as the checkpoint, so a
+    crashed run resumes from the last fully applied range.
+    """
+    token_ids = {e['token_id'] for e in events}
+    tokens = {t.token_id: t for t in NftToken.query.filter(NftToken.token_id.in_(token_ids))}
+
+    def token(token_id):
+        if token_id not in tokens:
+            tokens[token_id] = NftToken(token_id=token_id, purchases=0)
+            db.session.add(tokens[token_id])
+        return tokens[token_id]
+
+    minted = [e for e in events if e['event'] == 'minted']
+    unlinked = defaultdict(list)
+    if minted:
+        rows = db.session.query(Solution.id, Solution.title).filter(
+            Solution.nft_token_id.is_(None),
+            Solution.title.in_({e['title'] for e in minted})
+        ).order_by(Solution.id)
+        for solution_id, title in rows:
+            unlinked[title].append(solution_id)
+
+    for e in events:
+        t = token(e['token_id'])
+        if e['event'] == 'minted':
+            t.creator_address = t.owner_address = e['creator']
+            t.minted_block = e['block_number']
+            if t.solution_id is None and unlinked[e['title']]:
+                t.solution_id = unlinked[e['title']].pop(0)
+        else:
+            t.purchases += 1
+            t.owner_address = e['buyer']
+
+    # A linked Solution may have been deleted since; a bulk UPDATE by primary
+    # key fails on missing rows, which would wedge the checkpoint.
+    linked = {t.solution_id for t in tokens.values() if t.solution_id}
+    existing = set(db.session.scalars(db.select(Solution.id).where(Solution.id.in_(linked)))) if linked else set()
+    now = datetime.utcnow()
+    updates = [{'id': t.solution_id, 'nft_token_id': str(t.token_id), 'purchases': t.purchases, 'updated_at': now}
+               for t in tokens.values() if t.solution_id in existing]
+    if updates:
+        db.session.execute(db.update(Solution), updates)
+
+    checkpoint = db.session.get(IndexerCheckpoint, NFT_CHECKPOINT)
+    if checkpoint is None:
+        checkpoint = IndexerCheckpoint(name=NFT_CHECKPOINT, block_number=batch_end)
+        db.session.add(checkpoint)
+    checkpoint.block_number = batch_end
+    db.session.commit()
+    notify_writes(Solution, [('update', {'id': u['id'], '_changed': {'nft_token_id', 'purchases'}}) for u in updates])
+
+def run_nft_indexer(client, address, start_block=0, batch_size=2000, confirmations=6):
+    """Index from the checkpoint up to ``confirmations`` blocks behind head.
+
+    Returns ``(last_block, events_applied)``.
+    """
+    checkpoint = db.session.get(IndexerCheckpoint, NFT_CHECKPOINT)
+    from_block = checkpoint.block_number + 1 if checkpoint else start_block
+    head = client.block_number() - confirmations
+    applied = 0
+    last_block = from_block - 1
+    for batch_end, events in scan(client, address, from_block, head, batch_size):
+        apply_nft_events(events, batch_end)
+        applied += len(events)
+        last_block = batch_end
+    return last_block, applied
+
+@app.cli.command('nft-indexer')
+@click.option('--rpc-url', envvar='ETHEREUM_RPC_URL', required=True, help='JSON-RPC endpoint.')
+@click.option('--address', envvar='CONTRACT_ADDRESS', required=True, help='SolutionsMarketplace address.')
+@click.option('--start-block', envvar='NFT_INDEXER_START_BLOCK', type=int, default=0,
+              help='First block to scan when there is no checkpoint.')
+@click.option('--batch-size', type=int, default=2000, help='Blocks per eth_getLogs call.')
+@click.option('--confirmations', type=int, default=6, help='Stay this many blocks behind head.')
+@click.option('--follow', is_flag=True, help='Keep polling for new blocks.')
+@click.option('--interval', type=int, default=15, help='Seconds between polls with --follow.')
+def nft_indexer(rpc_url, address, start_block, batch_size, confirmations, follow, interval):
+    """Reconcile Solution token ids and purchases with the marketplace contract."""
+    client = JsonRpcClient(rpc_url)
+    while True:
+        last_block, applied = run_nft_indexer(client, address, start_block, batch_size, confirmations)
+        print(f'Indexed through block {last_block}: {applied} events')
+        if not follow:
+            break
+        time.sleep(interval)
+
+# Archival
+JOB_LISTING_DAYS = 60
+ARCHIVE_BATCH_SIZE = 500
+
+def _move_rows(source, archive, ids, now):
+    names = [c.name for c in source.__table__.columns]
+    db.session.execute(archive.__table__.insert().from_select(
+        names + ['archived_at'],
+        db.select(*source.__table__.columns, db.literal(now)).where(source.id.in_(ids))
+    ))
+    db.session.execute(source.__table__.delete().where(source.id.in_(ids)))
+
+def archive_stale_rows(now=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move past events, their registrations and expired jobs into archive tables.
+
+    Each batch is its own transaction, so a long run never holds a write lock
+    on the hot tables for more than one batch. Returns ``(events, jobs)`` moved.
+    """
+    now = now or datetime.utcnow()
+    job_cutoff = now - timedelta(days=JOB_LISTING_DAYS)
+    moved_events = moved_jobs = 0
+
+    while True:
+        event_ids = db.session.scalars(
+            db.select(Event.id).where(Event.date <= now).limit(batch_size)
+        ).all()
+        if not event_ids:
+            break
+        registration_ids = db.session.scalars(
+            db.select(Registration.id).where(Registration.event_id.in_(event_ids))
+        ).all()
+        for start in range(0, len(registration_ids), batch_size):
+            _move_rows(Registration, RegistrationArchive, registration_ids[start:start + batch_size], now)
+        _move_rows(Event, EventArchive, event_ids, now)
+        record_tombstones(db.session.connection(), Event, event_ids, now)
+        db.session.commit()
+        notify_writes(Event, [('delete', {'id': i}) for i in event_ids])
+        moved_events += len(event_ids)
+
+    while True:
+        job_ids = db.session.scalars(
+            db.select(Job.id).where(Job.created_at < job_cutoff).limit(batch_size)
+        ).all()
+        if not job_ids:
+            break
+        db.session.execute(JobLocation.__table__.delete().where(JobLocation.job_id.in_(job_ids)))
+        _move_rows(Job, JobArchive, job_ids, now)
+        record_tombstones(db.session.connection(), Job, job_ids, now)
+        db.session.commit()
+        notify_writes(Job, [('delete', {'id': i}) for i in job_ids])
+        moved_jobs += len(job_ids)
+
+    return moved_events, moved_jobs
+
+@app.cli.command('archive-stale')
+def archive_stale():
+    """Move past events and expired jobs out of the hot tables."""
+    events, jobs = archive_stale_rows()
+    print(f'Archived {events} events and {jobs} jobs')
+
+def user_summary(user):
+    return {'id': user.id, 'name': user.name} if user else None
+
+def _include_archived():
+    return request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+# Delta sync
+SYNC_PAGE_SIZE = 500
+SYNC_SETTLE_SECONDS = 5
+
+def parse_sync_token(token):
+    """Decode a ``?since=`` token into an ``(updated_at, id)`` cursor; '' means from the start."""
+    if not token:
+        return (datetime.min, 0)
+    timestamp, _, item_id = token.rpartition('_')
+    at = datetime.fromisoformat(timestamp)
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return (at, int(item_id))
+
+def sync_token(cursor):
+    return f'{cursor[0].isoformat()}_{cursor[1]}'
+
+def change_feed(model, serialize, options=()):
+    """Rows of ``model`` created, updated or deleted after the ``since`` cursor.
+
+    Rows are read in (updated_at, id) order from their index, so an unchanged
+    client costs one empty index range scan. The returned token never moves
+    past ``now - SYNC_SETTLE_SECONDS`` unless a page is full, so rows written
+    by transactions still committing are re-sent rather than skipped; clients
+    apply changes as upserts.
+    """
+    try:
+        since = parse_sync_token(request.args.get('since', ''))
+    except ValueError:
+        return jsonify({'error': 'Invalid since token'}), 400
+    since_at, since_id = since
+
+    rows = model.query.options(*options).filter(
+        model.updated_at >= since_at,
+        db.or_(model.updated_at > since_at, model.id > since_id)
+    ).order_by(model.updated_at, model.id).limit(SYNC_PAGE_SIZE + 1).all()
+    has_more = len(rows) > SYNC_PAGE_SIZE
+    rows = rows[:SYNC_PAGE_SIZE]
+
+    deleted = []
+    if since_at > datetime.min:
+        tombstones = db.session.query(Tombstone.item_id, Tombstone.deleted_at).filter(
+            Tombstone.resource == model.__tablename__,
+            Tombstone.deleted_at > since_at
+        )
+        if has_more:
+            # Deletes after this page's last row belong to a later page;
+            # folding them in would move the token past unsent rows.
+            tombstones = tombstones.filter(Tombstone.deleted_at <= rows[-1].updated_at)
+        deleted = tombstones.all()
+
+    cursor = since
+    if rows:
+        cursor = max(cursor, (rows[-1].updated_at, rows[-1].id))
+    if deleted:
+        cursor = max(cursor, (max(d.deleted_at for d in deleted), 0))
+    if not has_more:
+        settled = (datetime.utcnow() - timedelta(seconds=SYNC_SETTLE_SECONDS), 0)
+        cursor = max(min(cursor, settled), since)
+
+    return jsonify({
+        'changes': [serialize(row) for row in rows],
+        'deleted': sorted({d.item_id for d in deleted}),
+        'token': sync_token(cursor),
+        'has_more': has_more
+    })
+
+# Paginated listings
+class LazyPage:
+    """One page of a listing query, fetched the first time it is read.
+
+    Pages are rendered with stream_template, so the shell above the listing
+    flushes before the query runs. One extra row is fetched to tell whether
+    a next page exists without a COUNT.
+    """
+
+    def __init__(self, query, number, per_page, endpoint, args):
+        self.query = query
+        self.number = number
+        self.per_page = per_page
+        self.endpoint = endpoint
+        self.args = args
+        self._rows = None
+
+    def _fetch(self):
+        if self._rows is None:
+            rows = self.query.limit(self.per_page + 1).offset((self.number - 1) * self.per_page).all()
+            self.has_next = len(rows) > self.per_page
+            self._rows = rows[:self.per_page]
+        return self._rows
+
+    def __iter__(self):
+        return iter(self._fetch())
+
+    def __len__(self):
+        return len(self._fetch())
+
+    @property
+    def next_url(self):
+        self._fetch()
+        if not self.has_next:
+            return None
+        return url_for(self.endpoint, page=self.number + 1, **self.args)
+
+def listing_page(endpoint, query, state):
+    number = max(request.args.get('page', 1, type=int), 1)
+    per_page = app.config.get('POSTS_PER_PAGE', 20)
+    return LazyPage(query, number, per_page, endpoint, state)
+
+def render_fragment(template, page, **context):
+    """Render the item partials for a "load more" request."""
+    response = make_response(render_template(template, **context))
+    if page.next_url:
+        response.headers['X-Next-Page'] = page.next_url
+    return response
+
+def _solution_listing():
+    state = filter_state('solutions', request.args)
+    query = Solution.query.options(joinedload(Solution.creator)).filter(
+        *filter_clauses('solutions', state)
+    ).order_by(Solution.created_at.desc(), Solution.id.desc())
+    return listing_page('solutions_fragment', query, state)
+
+_job_count_cache = SingleFlight(max_entries=1)
+
+def job_count():
+    """Total live job postings, cached until a job is inserted or deleted."""
+    return _job_count_cache.get('jobs', lambda: Job.query.count())
+
+@on_commit(Job)
+def _invalidate_job_count(model, changes):
+    if touches(changes, set()):
+        _job_count_cache.invalidate()
+        publish('job-count')
+
+@shared_cache('job-count')
+def _reset_job_count():
+    _job_count_cache.invalidate()
+
+def _job_listing():
+    state = filter_state('hiring', request.args)
+    query = Job.query.options(joinedload(Job.employer)).filter(
+        *filter_clauses('hiring', state)
+    ).order_by(Job.created_at.desc(), Job.id.desc())
+    return listing_page('hiring_fragment', query, state)
+
+def _course_listing():
+    state = filter_state('learn', request.args)
+    query = Course.query.filter(
+        *filter_clauses('learn', state)
+    ).order_by(Course.created_at.desc(), Course.id.desc())
+    return listing_page('learn_fragment', query, state)
+
+# Response coalescing
+def single_flight(ttl=30, stale_ttl=300, models=(), columns=None, max_entries=256):
+    """Coalesce concurrent GET requests for the same URL into one view call.
+
+    The first request for a path and query string runs the view; identical
+    requests arriving while it runs wait for its response. The response is
+    then served from memory for ``ttl`` seconds, and stale for up to
+    ``stale_ttl`` more while a single request re-renders it. Commits that
+    insert or delete rows of ``models`` drop the cached responses, in this
+    and every other process, as do updates to any of ``columns`` (any update
+    if None). The response body is buffered, so don't use this on views that
+    stream their template.
+    """
+    def decorator(view):
+        cache = SingleFlight(ttl=ttl, stale_ttl=stale_ttl, max_entries=max_entries)
+
+        def render(kwargs):
+            response = make_response(view(**kwargs))
+            headers = [(k, v) for k, v in response.headers if k.lower() != 'set-cookie']
+            return response.get_data(), response.status_code, headers
+
+        @wraps(view)
+        def wrapper(**kwargs):
+            if request.method != 'GET':
+                return view(**kwargs)
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            body, status, headers = cache.get(key, lambda: render(kwargs))
+            return Response(body, status, headers)
+
+        watched = None if columns is None else set(columns)
+        channel = f'response:{view.__name__}'
+
+        @on_commit(*models)
+        def invalidate(model, changes):
+            if watched is None or touches(changes, watched):
+                cache.invalidate()
+                publish(channel)
+
+        shared_cache(channel)(cache.invalidate)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
 # Routes
 @app.route('/')
+@single_flight(models=(User, Solution, Job, Course), columns=())
 def index():
     stats = {
         'members': User.query.count(),
@@ -126,72 +1379,53 @@ def index():
 
 @app.route('/programs')
 def programs():
-    upcoming_events = Event.query.filter(
-        Event.date > datetime.utcnow(),
-        Event.event_type.in_(['webinar', 'workshop'])
-    ).order_by(Event.date).limit(5).all()
+    upcoming_events = event_schedule.upcoming(['webinar', 'workshop'], limit=5)
     return render_template('programs.html', events=upcoming_events)
 
 @app.route('/solutions')
 def solutions():
-    category = request.args.get('category', 'all')
-    stage = request.args.get('stage', 'all')
-    funding = request.args.get('funding', 'all')
-    
-    query = Solution.query
-    if category != 'all':
-        query = query.filter(Solution.category == category)
-    if stage != 'all':
-        query = query.filter(Solution.stage == stage)
-    if funding != 'all':
-        query = query.filter(Solution.funding_status == funding)
-    
-    solutions_list = query.order_by(Solution.created_at.desc()).all()
-    return render_template('solutions.html', solutions=solutions_list)
+    page = _solution_listing()
+    return stream_template('solutions.html', solutions=page, page=page, load_more_target='#solutions-grid')
+
+@app.route('/solutions/items')
+@single_flight(models=(Solution,))
+def solutions_fragment():
+    page = _solution_listing()
+    return render_fragment('partials/solution_list.html', page, solutions=page)
 
 @app.route('/hiring')
 def hiring():
-    job_type = request.args.get('type', 'all')
-    location = request.args.get('location', '')
-    remote = request.args.get('remote', False)
-    
-    query = Job.query
-    if job_type != 'all':
-        query = query.filter(Job.job_type == job_type)
-    if location:
-        query = query.filter(Job.location.contains(location))
-    if remote:
-        query = query.filter(Job.remote == True)
-    
-    jobs = query.order_by(Job.created_at.desc()).all()
-    return render_template('hiring.html', jobs=jobs)
+    page = _job_listing()
+    return stream_template('hiring.html', jobs=page, page=page, job_count=job_count(),
+                           load_more_target='#jobs-grid')
+
+@app.route('/hiring/items')
+@single_flight(models=(Job,))
+def hiring_fragment():
+    page = _job_listing()
+    return render_fragment('partials/job_list.html', page, jobs=page)
 
 @app.route('/learn')
 def learn():
-    category = request.args.get('category', 'all')
-    
-    query = Course.query
-    if category != 'all':
-        query = query.filter(Course.category == category)
-    
-    courses = query.order_by(Course.created_at.desc()).all()
-    return render_template('learn.html', courses=courses)
+    page = _course_listing()
+    return stream_template('learn.html', courses=page, page=page, load_more_target='#courses-grid')
+
+@app.route('/learn/items')
+@single_flight(models=(Course,))
+def learn_fragment():
+    page = _course_listing()
+    return render_fragment('partials/course_list.html', page, courses=page)
 
 @app.route('/community')
 def community():
-    next_fellowship = Event.query.filter(
-        Event.event_type == 'fellowship',
-        Event.date > datetime.utcnow()
-    ).order_by(Event.date).first()
+    fellowships = event_schedule.upcoming(['fellowship'], limit=1)
+    next_fellowship = fellowships[0] if fellowships else None
     
     return render_template('community.html', next_fellowship=next_fellowship)
 
 @app.route('/investors')
 def investors():
-    pitch_events = Event.query.filter(
-        Event.event_type == 'pitch',
-        Event.date > datetime.utcnow()
-    ).order_by(Event.date).limit(3).all()
+    pitch_events = event_schedule.upcoming(['pitch'], limit=3)
     
     return render_template('investors.html', pitch_events=pitch_events)
 
@@ -221,8 +1455,13 @@ def api_solutions():
         db.session.commit()
         return jsonify({'success': True, 'id': solution.id})
     
-    solutions = Solution.query.all()
-    return jsonify([{
+    if 'since' in request.args:
+        return change_feed(Solution, solution_json, [joinedload(Solution.creator)])
+    solutions = Solution.query.options(joinedload(Solution.creator)).all()
+    return jsonify([solution_json(s) for s in solutions])
+
+def solution_json(s):
+    return {
         'id': s.id,
         'title': s.title,
         'description': s.description,
@@ -232,8 +1471,27 @@ def api_solutions():
         'price_eth': s.price_eth,
         'views': s.views,
         'purchases': s.purchases,
-        'created_at': s.created_at.isoformat()
-    } for s in solutions])
+        'created_at': s.created_at.isoformat(),
+        'creator': user_summary(s.creator)
+    }
+
+@app.route('/api/solutions/trending')
+def api_solutions_trending():
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    ranked = ensure_trending().top(limit)
+    solutions = {s.id: s for s in Solution.query.options(joinedload(Solution.creator)).filter(
+        Solution.id.in_([i for i, _ in ranked])
+    )}
+    return jsonify([{
+        'id': s.id,
+        'title': s.title,
+        'category': s.category,
+        'price_eth': s.price_eth,
+        'views': s.views,
+        'purchases': s.purchases,
+        'creator': user_summary(s.creator),
+        'trending_score': round(score, 4)
+    } for s, score in ((solutions.get(i), score) for i, score in ranked) if s])
 
 @app.route('/api/jobs', methods=['GET', 'POST'])
 def api_jobs():
@@ -255,8 +1513,17 @@ def api_jobs():
         db.session.commit()
         return jsonify({'success': True, 'id': job.id})
     
-    jobs = Job.query.all()
-    return jsonify([{
+    if 'since' in request.args:
+        return change_feed(Job, job_json, [joinedload(Job.employer)])
+    jobs = Job.query.options(joinedload(Job.employer)).all()
+    if _include_archived():
+        jobs += JobArchive.query.options(selectinload(JobArchive.employer)).order_by(
+            JobArchive.created_at.desc()
+        ).all()
+    return jsonify([job_json(j) for j in jobs])
+
+def job_json(j):
+    return {
         'id': j.id,
         'title': j.title,
         'company': j.company,
@@ -267,13 +1534,20 @@ def api_jobs():
         'remote': j.remote,
         'featured': j.featured,
         'applications': j.applications,
-        'created_at': j.created_at.isoformat()
-    } for j in jobs])
+        'created_at': j.created_at.isoformat(),
+        'archived': isinstance(j, JobArchive),
+        'employer': user_summary(j.employer)
+    }
 
 @app.route('/api/courses')
 def api_courses():
+    if 'since' in request.args:
+        return change_feed(Course, course_json)
     courses = Course.query.all()
-    return jsonify([{
+    return jsonify([course_json(c) for c in courses])
+
+def course_json(c):
+    return {
         'id': c.id,
         'title': c.title,
         'category': c.category,
@@ -285,12 +1559,19 @@ def api_courses():
         'rating': c.rating,
         'students': c.students,
         'featured': c.featured
-    } for c in courses])
+    }
 
 @app.route('/api/events')
 def api_events():
-    events = Event.query.filter(Event.date > datetime.utcnow()).all()
-    return jsonify([{
+    if 'since' in request.args:
+        return change_feed(Event, event_json)
+    events = event_schedule.upcoming()
+    if _include_archived():
+        events += EventArchive.query.order_by(EventArchive.date.desc()).all()
+    return jsonify([event_json(e) for e in events])
+
+def event_json(e):
+    return {
         'id': e.id,
         'title': e.title,
         'event_type': e.event_type,
@@ -300,8 +1581,16 @@ def api_events():
         'capacity': e.capacity,
         'registered': e.registered,
         'price': e.price,
-        'speaker': e.speaker
-    } for e in events])
+        'speaker': e.speaker,
+        'archived': isinstance(e, EventArchive)
+    }
+
+@app.route('/api/facets/<resource>')
+def api_facets(resource):
+    if resource not in FACETS:
+        return jsonify({'error': 'Unknown resource'}), 404
+    state = filter_state(resource, request.args)
+    return jsonify({'filters': state, 'facets': facet_counts(resource, state)})
 
 @app.route('/api/pitch-application', methods=['POST'])
 def api_pitch_application():
@@ -343,17 +1632,73 @@ def api_register_event():
     
     return jsonify({'success': True, 'message': 'Registration successful!'})
 
+@app.route('/api/event/<int:event_id>/attendees')
+@admin_required
+def api_event_attendees(event_id):
+    event = Event.query.options(
+        selectinload(Event.registrations).joinedload(Registration.user)
+    ).get_or_404(event_id)
+    return jsonify([{
+        'id': r.id,
+        'registration_type': r.registration_type,
+        'created_at': r.created_at.isoformat(),
+        'user': dict(user_summary(r.user), email=r.user.email) if r.user else None
+    } for r in event.registrations])
+
+@app.route('/api/admin/export/pitch-applications')
+@admin_required
+def api_export_pitch_applications():
+    try:
+        since, until = _parse_date_arg('since'), _parse_date_arg('until')
+    except ValueError:
+        return jsonify({'error': 'Dates must be ISO 8601'}), 400
+    stmt = db.select(*PitchApplication.__table__.columns).order_by(PitchApplication.id)
+    if request.args.get('status'):
+        stmt = stmt.where(PitchApplication.status == request.args['status'])
+    if since:
+        stmt = stmt.where(PitchApplication.created_at >= since)
+    if until:
+        stmt = stmt.where(PitchApplication.created_at < until)
+    return stream_export(stmt, 'pitch-applications', request.args.get('format', 'csv'))
+
+@app.route('/api/admin/export/registrations')
+@admin_required
+def api_export_registrations():
+    try:
+        since, until = _parse_date_arg('since'), _parse_date_arg('until')
+    except ValueError:
+        return jsonify({'error': 'Dates must be ISO 8601'}), 400
+    stmt = db.select(
+        *Registration.__table__.columns,
+        Event.title.label('event_title'),
+        User.name.label('user_name'),
+        User.email.label('user_email')
+    ).outerjoin(Event, Registration.event_id == Event.id).outerjoin(
+        User, Registration.user_id == User.id
+    ).order_by(Registration.id)
+    event_id = request.args.get('event_id', type=int)
+    if event_id:
+        stmt = stmt.where(Registration.event_id == event_id)
+    if since:
+        stmt = stmt.where(Registration.created_at >= since)
+    if until:
+        stmt = stmt.where(Registration.created_at < until)
+    return stream_export(stmt, 'registrations', request.args.get('format', 'csv'))
+
 @app.route('/api/stats')
+@single_flight(models=(User, Solution, Job, Course, Event), columns=('date',))
 def api_stats():
     return jsonify({
         'members': User.query.count(),
         'solutions': Solution.query.count(),
         'jobs': Job.query.count(),
         'courses': Course.query.count(),
-        'events': Event.query.filter(Event.date > datetime.utcnow()).count()
+        'events': event_schedule.count()
     })
 
 @app.route('/api/search')
+@single_flight(ttl=60, models=(Solution, Job, Course), max_entries=1024,
+               columns=('title', 'description', 'category', 'company', 'location', 'instructor'))
 def api_search():
     query = request.args.get('q', '')
     category = request.args.get('category', 'all')
@@ -398,28 +1743,163 @@ def api_search():
     
     return jsonify(results)
 
+@app.route('/api/suggest')
+def api_suggest():
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int), 50)
+    matches = ensure_suggest_index().lookup(query, limit=limit)
+    return jsonify([{
+        'type': kind,
+        'id': item_id,
+        'title': title,
+        'detail': detail
+    } for kind, item_id, title, detail in matches])
+
+@app.route('/api/solution/<int:solution_id>/similar')
+def api_solution_similar(solution_id):
+    solution = Solution.query.get_or_404(solution_id)
+    limit = max(1, min(request.args.get('limit', 5, type=int), 50))
+    text = similarity_text(Solution, _row_snapshot(solution))
+    ranked = ensure_similarity(Solution).query(text, limit, exclude=solution.id)
+    return jsonify([{
+        'id': s.id,
+        'title': s.title,
+        'category': s.category,
+        'price_eth': s.price_eth,
+        'score': round(score, 4)
+    } for s, score in similar_items(Solution, ranked)])
+
+@app.route('/api/job/<int:job_id>/courses')
+def api_job_courses(job_id):
+    job = Job.query.get_or_404(job_id)
+    limit = max(1, min(request.args.get('limit', 5, type=int), 50))
+    ranked = ensure_similarity(Course).query(similarity_text(Job, _row_snapshot(job)), limit)
+    return jsonify([{
+        'id': c.id,
+        'title': c.title,
+        'category': c.category,
+        'instructor': c.instructor,
+        'level': c.level,
+        'score': round(score, 4)
+    } for c, score in similar_items(Course, ranked)])
+
+BATCH_MAX_REQUESTS = 20
+
+def _dispatch_subrequest(path, params):
+    """Run a GET for ``path`` inside the current app context and return the response.
+
+    The sub-request reuses the caller's environ (cookies, session, headers) and
+    the app context's db.session, so every sub-request shares one connection.
+    """
+    environ = dict(request.environ,
+                   PATH_INFO=path,
+                   QUERY_STRING=urlencode(params or {}, doseq=True),
+                   REQUEST_METHOD='GET',
+                   CONTENT_LENGTH='0')
+    environ['wsgi.input'] = io.BytesIO()
+    environ.pop('werkzeug.request', None)
+    with app.request_context(environ):
+        return app.full_dispatch_request()
+
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    data = request.get_json(silent=True) or {}
+    subrequests = data.get('requests')
+    if not isinstance(subrequests, list) or not subrequests:
+        return jsonify({'error': 'Expected a non-empty "requests" list'}), 400
+    if len(subrequests) > BATCH_MAX_REQUESTS:
+        return jsonify({'error': f'At most {BATCH_MAX_REQUESTS} requests per batch'}), 400
+
+    responses = []
+    for i, sub in enumerate(subrequests):
+        sub = sub if isinstance(sub, dict) else {}
+        path, params = sub.get('path', ''), sub.get('params') or {}
+        entry = {'id': sub.get('id', i), 'path': path}
+        if not isinstance(path, str) or not path.startswith('/api/') or path.rstrip('/') == '/api/batch':
+            entry.update(status=400, body={'error': 'Only /api/ GET routes can be batched'})
+        elif not isinstance(params, dict):
+            entry.update(status=400, body={'error': '"params" must be an object'})
+        else:
+            # One failing sub-request must not take down the rest of the batch.
+            try:
+                response = _dispatch_subrequest(path, params)
+                entry['status'] = response.status_code
+                entry['body'] = response.get_json() if response.is_json else response.get_data(as_text=True)
+            except Exception:
+                app.logger.exception('Batched request to %s failed', path)
+                db.session.rollback()
+                entry.update(status=500, body={'error': 'Internal server error'})
+        responses.append(entry)
+    return jsonify({'responses': responses})
+
 @app.route('/api/solution/<int:solution_id>/view', methods=['POST'])
 def api_solution_view(solution_id):
     solution = Solution.query.get_or_404(solution_id)
     solution.views += 1
-    db.session.commit()
+    record_engagement(solution_id, 'view')
     return jsonify({'success': True, 'views': solution.views})
 
 @app.route('/api/solution/<int:solution_id>/purchase', methods=['POST'])
 def api_solution_purchase(solution_id):
     solution = Solution.query.get_or_404(solution_id)
     solution.purchases += 1
-    db.session.commit()
+    record_engagement(solution_id, 'purchase')
     return jsonify({'success': True, 'message': 'Purchase successful!'})
 
+@app.route('/api/solution/<int:solution_id>/analytics')
+def api_solution_analytics(solution_id):
+    granularity = request.args.get('granularity', 'hour')
+    if granularity not in ROLLUPS:
+        return jsonify({'error': 'granularity must be hour or day'}), 400
+    model, width, max_buckets = ROLLUPS[granularity]
+    try:
+        end = _parse_date_arg('end') or datetime.utcnow()
+        start = _parse_date_arg('start') or end - width * (24 if granularity == 'hour' else 30)
+    except ValueError:
+        return jsonify({'error': 'Dates must be ISO 8601'}), 400
+    first, last = bucket_start(start, granularity), bucket_start(end, granularity)
+    buckets = int((last - first) / width) + 1
+    if buckets > max_buckets or buckets < 1:
+        return jsonify({'error': f'Range must cover 1 to {max_buckets} buckets'}), 400
+
+    Solution.query.get_or_404(solution_id)
+    rows = {r.bucket_start: r for r in model.query.filter(
+        model.solution_id == solution_id,
+        model.bucket_start.between(first, last)
+    )}
+    series = []
+    for i in range(buckets):
+        moment = first + width * i
+        row = rows.get(moment)
+        series.append({
+            'start': moment.isoformat(),
+            'views': row.views if row else 0,
+            'purchases': row.purchases if row else 0
+        })
+    return jsonify({'solution_id': solution_id, 'granularity': granularity, 'buckets': series})
+
 # Initialize database
+def apply_migrations():
+    """Bring tables created before a column was added up to date.
+
+    create_all() only creates missing tables, so changes to existing ones ship
+    as migrations in migrations/versions and are applied here on startup.
+    """
+    config = migrate.get_config()
+    config.attributes['configure_logger'] = False
+    alembic_command.upgrade(config, 'head')
+
 def create_tables():
     with app.app_context():
         db.create_all()
+        apply_migrations()
+        _register_cache_versions()
         
         # Add sample data if tables are empty
-        if User.query.count() == 0:
-            sample_user = User(
+        if User.query.count() > 0:
+            return
+
+        sample_user = User(
             name='Vincent Kimuri',
             email='vincent@innovatorsofhonour.com',
             role='admin'
@@ -557,6 +2037,30 @@ def create_tables():
         
         db.session.commit()
 
+def warm_up():
+    """Build in-process caches and compile templates ahead of serving.
+
+    Under gunicorn's preload_app this runs once in the master, so forked
+    workers share the warmed structures copy-on-write.
+    """
+    with app.app_context():
+        # Record the current cache versions first, so forked workers only
+        # reset what was written after the caches below were built.
+        sync_shared_caches(force=True)
+        ensure_suggest_index()
+        ensure_trending()
+        for model in SIMILARITY_SOURCES:
+            ensure_similarity(model)
+        event_schedule.upcoming()
+        for resource in FACETS:
+            facet_counts(resource, {})
+        job_count()
+        for name in app.jinja_env.list_templates():
+            if name.endswith('.html'):
+                app.jinja_env.get_template(name)
+        # Connections must not be shared across fork.
+        db.engine.dispose()
+
 # Initialize database on startup
 create_tables()
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the /hiring location filter: leading-wildcard LIKE on Job.location
+versus the indexed JobLocation token lookup.
+
+Usage: python benchmarks/bench_job_locations.py [job_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select
+
+from app import Job, JobLocation, db, job_location_clause, location_tokens
+
+CITIES = [
+    ('Nairobi', 'Kenya'), ('Mombasa', 'Kenya'), ('Kisumu', 'Kenya'), ('Kampala', 'Uganda'),
+    ('Lagos', 'Nigeria'), ('Accra', 'Ghana'), ('Kigali', 'Rwanda'), ('Cape Town', 'South Africa'),
+    ('Addis Ababa', 'Ethiopia'), ('Dar es Salaam', 'Tanzania'), ('London', 'United Kingdom'),
+    ('Berlin', 'Germany'), ('New York', 'United States'), ('Toronto', 'Canada'),
+]
+QUERIES = ['Nairobi', 'nairobi, kenya', 'Kenya', 'Cape', 'remote', 'Toronto']
+
+
+def populate(engine, count):
+    random.seed(42)
+    with engine.begin() as conn:
+        for start in range(0, count, 10000):
+            jobs, tokens = [], []
+            for job_id in range(start + 1, min(start + 10000, count) + 1):
+                remote = random.random() < 0.2
+                location = 'Remote' if remote and random.random() < 0.5 else ', '.join(random.choice(CITIES))
+                jobs.append({
+                    'id': job_id, 'title': f'Job {job_id}', 'company': 'Bench Co',
+                    'location': location, 'job_type': 'Full-time',
+                    'description': 'Benchmark job', 'remote': remote,
+                })
+                tokens.extend({'job_id': job_id, 'kind': kind, 'token': token}
+                              for kind, token in location_tokens(location, remote))
+            conn.execute(Job.__table__.insert(), jobs)
+            conn.execute(JobLocation.__table__.insert(), tokens)
+
+
+def timed(conn, clause, repeat=5):
+    stmt = select(func.count()).select_from(Job).where(clause)
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        total = conn.execute(stmt).scalar()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return total, best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.metadata.create_all(engine)
+
+        started = time.perf_counter()
+        populate(engine, count)
+        print(f'Populated {count} jobs in {time.perf_counter() - started:.1f}s')
+
+        print(f"{'query':<18}{'matches':>10}{'LIKE ms':>12}{'index ms':>12}")
+        with engine.connect() as conn:
+            for query in QUERIES:
+                like_total, like_ms = timed(conn, Job.location.contains(query))
+                index_total, index_ms = timed(conn, job_location_clause(query))
+                print(f'{query:<18}{index_total:>10}{like_ms:>12.1f}{index_ms:>12.1f}'
+                      + ('' if like_total == index_total else f'  (LIKE matched {like_total})'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the gunicorn profile: time-to-ready and per-worker
+memory, with and without preload_app.
+
+Usage: python benchmarks/bench_startup.py [workers]
+Linux only (reads /proc). RSS counts shared pages in every worker; PSS splits
+them between the processes sharing them, so it shows the copy-on-write win.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 5099
+
+
+def read_kb(path, field):
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def wait_ready(url, deadline):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def run(preload, workers):
+    env = dict(os.environ, PORT=str(PORT), WEB_CONCURRENCY=str(workers),
+               GUNICORN_PRELOAD='1' if preload else '0')
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_ready(f'http://127.0.0.1:{PORT}/api/stats', started + 60):
+            raise RuntimeError('gunicorn did not become ready')
+        first_response = time.monotonic() - started
+        while len(children(proc.pid)) < workers and time.monotonic() - started < 60:
+            time.sleep(0.05)
+        # Hit every worker a few times so lazily built state is counted.
+        for _ in range(workers * 4):
+            wait_ready(f'http://127.0.0.1:{PORT}/solutions', time.monotonic() + 5)
+        all_ready = time.monotonic() - started
+        pids = children(proc.pid)
+        rss = [read_kb(f'/proc/{p}/status', 'VmRSS') for p in pids]
+        pss = [read_kb(f'/proc/{p}/smaps_rollup', 'Pss') for p in pids]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+    return first_response, all_ready, rss, pss
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"{'mode':<12}{'first 200 s':>12}{'warm s':>9}{'RSS/worker MB':>16}{'PSS/worker MB':>16}")
+    for preload in (False, True):
+        first, ready, rss, pss = run(preload, workers)
+        mean = lambda values: sum(values) / len(values) / 1024 if values else 0
+        print(f"{'preload' if preload else 'no preload':<12}{first:>12.2f}{ready:>9.2f}"
+              f"{mean(rss):>16.1f}{mean(pss):>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
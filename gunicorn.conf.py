@@ -0,0 +1,55 @@
+"""
+Gunicorn production profile for Innovators of Honour.
+Used by the Procfile: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+# Each worker keeps its own in-process caches (facets, suggestions, schedule,
+# trending); they pick up other workers' writes through the CacheVersion
+# table, checked at most once per app.CACHE_SYNC_INTERVAL.
+workers = int(os.environ.get('WEB_CONCURRENCY', min(cpu_count * 2 + 1, 12)))
+# Requests spend most of their time waiting on the database, so a few
+# threads per worker help; single-core hosts get more threads instead.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if cpu_count > 1 else 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+max_requests = 2000
+max_requests_jitter = 200
+
+# Import, seed and warm the app once in the master, then fork.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app import warm_up
+    warm_up()
+    # Move everything allocated so far out of the GC's reach so collections in
+    # workers do not touch (and un-share) the pages inherited from the master.
+    gc.freeze()
+    server.log.info('App warmed up in master; forking workers')
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        from app import warm_up
+        warm_up()
+
+
+def post_fork(server, worker):
+    from app import app, db
+    # Drop any pooled connections inherited from the master without closing
+    # them, since the master still owns the underlying sockets/file handles.
+    with app.app_context():
+        db.engine.dispose(close=False)
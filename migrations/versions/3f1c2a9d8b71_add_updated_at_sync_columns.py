@@ -0,0 +1,43 @@
+"""add updated_at sync columns
+
+Adds the updated_at column and (updated_at, id) index used by the ?since=
+change feed to tables that predate it. Databases created after the column
+was added to the models already have both, so each step checks first.
+
+Revision ID: 3f1c2a9d8b71
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d8b71'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLES = ('solution', 'job', 'course', 'event')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    for table in TABLES:
+        if table not in existing:
+            continue
+        if 'updated_at' not in {c['name'] for c in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+            op.execute(f'UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)')
+        index = f'ix_{table}_updated_at_id'
+        if index not in {i['name'] for i in inspector.get_indexes(table)}:
+            op.create_index(index, table, ['updated_at', 'id'])
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_updated_at_id', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,53 @@
+"""never reuse ids of archived rows on sqlite
+
+Archival moves job, event and registration rows into *_archive tables that
+keep the original id as their primary key. Without AUTOINCREMENT, SQLite
+hands the highest freed id to the next insert, and archiving that row
+later collides with the archived copy. Rebuilds the three tables with
+AUTOINCREMENT and starts their sequences past every archived id.
+
+Revision ID: 7b2e4c1f9a30
+Revises: 3f1c2a9d8b71
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4c1f9a30'
+down_revision = '3f1c2a9d8b71'
+branch_labels = None
+depends_on = None
+
+TABLES = {'event': 'event_archive', 'registration': 'registration_archive', 'job': 'job_archive'}
+
+
+def _create_sql(bind, table):
+    return bind.execute(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                        {'name': table}).scalar()
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    existing = set(sa.inspect(bind).get_table_names())
+    for table, archive in TABLES.items():
+        sql = _create_sql(bind, table)
+        if sql is None or 'AUTOINCREMENT' in sql.upper():
+            continue
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        highest = bind.execute(sa.text(f'SELECT MAX(id) FROM {table}')).scalar() or 0
+        if archive in existing:
+            highest = max(highest, bind.execute(sa.text(f'SELECT MAX(id) FROM {archive}')).scalar() or 0)
+        bind.execute(sa.text('DELETE FROM sqlite_sequence WHERE name = :name'), {'name': table})
+        bind.execute(sa.text('INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)'),
+                     {'name': table, 'seq': highest})
+
+
+def downgrade():
+    # AUTOINCREMENT only stops id reuse; leaving it in place is harmless.
+    pass
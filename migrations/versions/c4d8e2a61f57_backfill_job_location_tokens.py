@@ -0,0 +1,67 @@
+"""backfill job location tokens
+
+The job_location table is created empty by create_all() on databases that
+predate it, and only jobs written since then get tokens from the model
+hooks. Indexes every job that has none yet, so location search and the
+location facet cover existing jobs.
+
+Revision ID: c4d8e2a61f57
+Revises: 7b2e4c1f9a30
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8e2a61f57'
+down_revision = '7b2e4c1f9a30'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+# Frozen copies of normalize_location()/location_tokens() in app.py as of
+# this revision; migrations must not import the app.
+def normalize_location(text):
+    return ' '.join(''.join(ch if ch.isalnum() else ' ' for ch in (text or '').casefold()).split())
+
+
+def location_tokens(location, remote=False):
+    parts = [p for p in (normalize_location(part) for part in (location or '').split(',')) if p]
+    tokens = set()
+    if remote or 'remote' in parts:
+        tokens.add(('remote', 'remote'))
+    parts = [p for p in parts if p != 'remote']
+    for i, part in enumerate(parts):
+        if i == 0:
+            kind = 'city'
+        elif i == len(parts) - 1:
+            kind = 'country'
+        else:
+            kind = 'region'
+        tokens.add((kind, part))
+    return tokens
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not {'job', 'job_location'} <= set(sa.inspect(bind).get_table_names()):
+        return
+    job_location = sa.table('job_location', sa.column('job_id'), sa.column('kind'), sa.column('token'))
+    jobs = bind.execute(sa.text(
+        'SELECT id, location, remote FROM job '
+        'WHERE NOT EXISTS (SELECT 1 FROM job_location WHERE job_location.job_id = job.id)'
+    )).all()
+    rows = [{'job_id': job_id, 'kind': kind, 'token': token}
+            for job_id, location, remote in jobs
+            for kind, token in location_tokens(location, remote)]
+    for start in range(0, len(rows), BATCH_SIZE):
+        op.bulk_insert(job_location, rows[start:start + BATCH_SIZE])
+
+
+def downgrade():
+    # Tokens are also maintained by the app; there is nothing to undo.
+    pass
@@ -0,0 +1,110 @@
+"""
+Minimal JSON-RPC log reader for SolutionsMarketplace.sol events.
+
+Pulls SolutionMinted and SolutionPurchased logs in block-range batches over
+plain JSON-RPC, so it runs against any node (Hardhat, anvil, Infura) or a
+stub transport in tests without a web3 dependency.
+"""
+
+import json
+import urllib.request
+
+# keccak256 of the event signatures (enums are encoded as uint8)
+SOLUTION_MINTED = '0x14d3417832dc602803a192bf2b3a1597d768feb436d3698d5ac140e8946d2b53'
+SOLUTION_PURCHASED = '0x3797699ecd0f800114fb4253f5dc79542edcb0f15ff52ea6ed4ebe8abad45a90'
+
+
+class RpcError(Exception):
+    pass
+
+
+class JsonRpcClient:
+    """JSON-RPC 2.0 client; ``transport(payload) -> response`` can be swapped for a stub."""
+
+    def __init__(self, url=None, transport=None, timeout=30):
+        self.url = url
+        self.timeout = timeout
+        self.transport = transport or self._http
+        self._next_id = 0
+
+    def _http(self, payload):
+        request = urllib.request.Request(self.url, data=json.dumps(payload).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def call(self, method, *params):
+        self._next_id += 1
+        response = self.transport({'jsonrpc': '2.0', 'id': self._next_id, 'method': method, 'params': list(params)})
+        if response.get('error'):
+            raise RpcError(response['error'].get('message', 'RPC error'))
+        return response['result']
+
+    def block_number(self):
+        return int(self.call('eth_blockNumber'), 16)
+
+    def get_logs(self, address, from_block, to_block, topics):
+        return self.call('eth_getLogs', {
+            'address': address,
+            'fromBlock': hex(from_block),
+            'toBlock': hex(to_block),
+            'topics': [topics],
+        })
+
+
+def _words(data):
+    raw = bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    return raw, [int.from_bytes(raw[i:i + 32], 'big') for i in range(0, len(raw), 32)]
+
+
+def _address(topic):
+    return '0x' + topic[-40:].lower()
+
+
+def _string_at(raw, offset):
+    length = int.from_bytes(raw[offset:offset + 32], 'big')
+    return raw[offset + 32:offset + 32 + length].decode('utf-8', errors='replace')
+
+
+def decode_log(log):
+    """Turn a raw log into a ``dict`` with an ``event`` name, or None if unknown."""
+    topics = log['topics']
+    base = {
+        'block_number': int(log['blockNumber'], 16),
+        'log_index': int(log['logIndex'], 16),
+        'tx_hash': log.get('transactionHash'),
+        'token_id': int(topics[1], 16),
+    }
+    raw, words = _words(log['data'])
+    if topics[0] == SOLUTION_MINTED:
+        return dict(base, event='minted', creator=_address(topics[2]),
+                    title=_string_at(raw, words[0]), category=words[1],
+                    price_wei=words[2], ipfs_uri=_string_at(raw, words[3]))
+    if topics[0] == SOLUTION_PURCHASED:
+        return dict(base, event='purchased', buyer=_address(topics[2]),
+                    seller=_address(topics[3]), price_wei=words[0])
+    return None
+
+
+def scan(client, address, from_block, to_block, batch_size=2000):
+    """Yield ``(batch_end, events)`` for consecutive block ranges, oldest first.
+
+    A range the node refuses (most providers cap results per call) is
+    retried at half the size, down to a single block.
+    """
+    start = from_block
+    size = batch_size
+    while start <= to_block:
+        end = min(start + size - 1, to_block)
+        try:
+            logs = client.get_logs(address, start, end, [SOLUTION_MINTED, SOLUTION_PURCHASED])
+        except RpcError:
+            if size == 1:
+                raise
+            size = max(size // 2, 1)
+            continue
+        events = [e for e in map(decode_log, logs) if e]
+        events.sort(key=lambda e: (e['block_number'], e['log_index']))
+        yield end, events
+        start = end + 1
+        size = batch_size
@@ -0,0 +1,80 @@
+"""
+In-process index of upcoming events, sorted by start date and bucketed by type.
+Reads skip past events with a bisect, so entries expire as their start time passes.
+"""
+
+import heapq
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from itertools import islice
+
+
+def _stream(dates, events, start):
+    for i in range(start, len(dates)):
+        yield dates[i], events[i].id, events[i]
+
+
+class EventSchedule:
+    """Future events kept sorted by ``date`` and grouped by ``event_type``.
+
+    ``loader`` returns the upcoming events (objects with ``id``, ``date`` and
+    ``event_type`` attributes). It is called lazily on the first read after
+    ``invalidate()``, so a burst of writes costs a single rebuild.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._version = 0
+        self._built = -1
+        self._buckets = {}
+
+    def invalidate(self):
+        self._version += 1
+
+    def _current(self):
+        if self._built != self._version:
+            with self._lock:
+                if self._built != self._version:
+                    version = self._version
+                    buckets = {}
+                    for event in sorted(self._loader(), key=lambda e: (e.date, e.id)):
+                        dates, events = buckets.setdefault(event.event_type, ([], []))
+                        dates.append(event.date)
+                        events.append(event)
+                    self._buckets = buckets
+                    self._built = version
+        return self._buckets
+
+    def _trim(self, event_type, dates, start):
+        # Drop expired entries once they make up most of a bucket. ``start``
+        # indexes the ``dates`` list the caller read; skip if a rebuild has
+        # replaced that bucket since.
+        with self._lock:
+            bucket = self._buckets.get(event_type)
+            if bucket is not None and bucket[0] is dates and start > len(dates) // 2:
+                self._buckets[event_type] = (dates[start:], bucket[1][start:])
+
+    def upcoming(self, event_types=None, limit=None, now=None):
+        """Return events starting after ``now``, soonest first."""
+        now = now or datetime.utcnow()
+        buckets = self._current()
+        streams = []
+        for event_type in (event_types or list(buckets)):
+            dates, events = buckets.get(event_type, ([], []))
+            start = bisect_right(dates, now)
+            if start:
+                self._trim(event_type, dates, start)
+            streams.append(_stream(dates, events, start))
+        merged = heapq.merge(*streams, key=lambda item: item[:2])
+        return [event for _, _, event in islice(merged, limit)]
+
+    def count(self, event_types=None, now=None):
+        now = now or datetime.utcnow()
+        buckets = self._current()
+        total = 0
+        for event_type in (event_types or list(buckets)):
+            dates, _ = buckets.get(event_type, ([], []))
+            total += len(dates) - bisect_right(dates, now)
+        return total
@@ -0,0 +1,178 @@
+"""
+TF-IDF similarity index for "similar items" recommendations.
+
+Rows are L2-normalized TF-IDF vectors in a float32 CSR matrix, so cosine
+similarity against every stored item is one sparse matrix-vector product.
+Snapshots are plain .npy arrays that load memory-mapped.
+"""
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+from scipy import sparse
+
+_WORD = re.compile(r'[a-z0-9][a-z0-9+#]+')
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this
+to with will we our you your can into using use new all more their
+""".split())
+
+
+def tokenize(text):
+    return [w for w in _WORD.findall((text or '').lower()) if w not in STOP_WORDS]
+
+
+class TfidfIndex:
+    """Incrementally extendable TF-IDF index with cosine top-K queries.
+
+    ``build()`` fits IDF weights over the full corpus. ``add()`` vectorizes new
+    items with the current weights (unseen terms get the rarest-term weight)
+    and appends them, so IDF drifts until the next full build; deleted items
+    are masked out rather than removed from the matrix.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.vocab = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.ids = []
+        self._rows = {}  # item_id -> row number
+        self._removed = set()
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._pending = []  # (indices, data) of rows not yet stacked
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, item_id):
+        return item_id in self._rows
+
+    def _vectorize(self, text, grow=False):
+        counts = {}
+        for term in tokenize(text):
+            col = self.vocab.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = self.vocab[term] = len(self.vocab)
+            counts[col] = counts.get(col, 0) + 1
+        if len(self.vocab) > len(self.idf):
+            rare = self.idf.max() if len(self.idf) else 1.0
+            self.idf = np.concatenate([self.idf, np.full(len(self.vocab) - len(self.idf), rare, np.float32)])
+        indices = np.fromiter(counts, dtype=np.int32, count=len(counts))
+        data = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * self.idf[indices]
+        norm = np.linalg.norm(data)
+        return indices, (data / norm if norm else data)
+
+    def build(self, items):
+        """Fit on ``(item_id, text)`` pairs, replacing the current contents."""
+        docs = [(item_id, tokenize(text)) for item_id, text in items]
+        vocab, rows, cols, values = {}, [], [], []
+        for row, (_, terms) in enumerate(docs):
+            counts = {}
+            for term in terms:
+                col = vocab.setdefault(term, len(vocab))
+                counts[col] = counts.get(col, 0) + 1
+            rows.extend([row] * len(counts))
+            cols.extend(counts)
+            values.extend(counts.values())
+        counts = sparse.csr_matrix((np.array(values, np.float32), (rows, cols)),
+                                   shape=(len(docs), len(vocab)), dtype=np.float32)
+        df = np.bincount(counts.indices, minlength=len(vocab))
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+        matrix = counts.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix = sparse.diags(1 / norms).dot(matrix).astype(np.float32).tocsr()
+        with self._lock:
+            self._reset()
+            self.vocab, self.idf, self._matrix = vocab, idf, matrix
+            self.ids = [item_id for item_id, _ in docs]
+            self._rows = {item_id: row for row, item_id in enumerate(self.ids)}
+
+    def add(self, item_id, text):
+        """Append (or replace) one item without refitting."""
+        with self._lock:
+            if item_id in self._rows:
+                self._removed.add(self._rows[item_id])
+            self._rows[item_id] = len(self.ids)
+            self.ids.append(item_id)
+            self._pending.append(self._vectorize(text, grow=True))
+
+    def remove(self, item_id):
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is not None:
+                self._removed.add(row)
+
+    def _compact(self):
+        width = len(self.vocab)
+        matrix = self._matrix
+        if matrix.shape[1] < width:
+            matrix = sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                                       shape=(matrix.shape[0], width))
+        if self._pending:
+            indptr = np.cumsum([0] + [len(indices) for indices, _ in self._pending])
+            block = sparse.csr_matrix((
+                np.concatenate([data for _, data in self._pending]).astype(np.float32),
+                np.concatenate([indices for indices, _ in self._pending]).astype(np.int32),
+                indptr
+            ), shape=(len(self._pending), width))
+            matrix = sparse.vstack([matrix, block], format='csr', dtype=np.float32)
+            self._pending = []
+        self._matrix = matrix
+        return matrix
+
+    def query(self, text, k=5, exclude=None):
+        """Return ``[(item_id, score)]`` for the ``k`` items most similar to ``text``."""
+        with self._lock:
+            indices, data = self._vectorize(text)
+            matrix = self._compact()
+            if k <= 0 or not len(indices) or not matrix.shape[0]:
+                return []
+            vector = np.zeros(matrix.shape[1], dtype=np.float32)
+            vector[indices] = data
+            scores = matrix.dot(vector)
+            if self._removed:
+                scores[list(self._removed)] = -1
+            if exclude in self._rows:
+                scores[self._rows[exclude]] = -1
+            ids = self.ids
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path):
+        """Write a snapshot that ``load(path)`` can memory-map."""
+        with self._lock:
+            matrix = self._compact()
+            os.makedirs(path, exist_ok=True)
+            for name in ('data', 'indices', 'indptr'):
+                np.save(os.path.join(path, f'{name}.npy'), getattr(matrix, name))
+            np.save(os.path.join(path, 'idf.npy'), self.idf)
+            with open(os.path.join(path, 'meta.json'), 'w') as f:
+                json.dump({'terms': list(self.vocab), 'ids': self.ids, 'removed': sorted(self._removed),
+                           'shape': list(matrix.shape)}, f)
+
+    def load(self, path, mmap_mode='r'):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                  for name in ('data', 'indices', 'indptr', 'idf')}
+        matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                   shape=tuple(meta['shape']), copy=False)
+        with self._lock:
+            self._reset()
+            self.vocab = {term: col for col, term in enumerate(meta['terms'])}
+            self.idf = np.array(arrays['idf'])
+            self._matrix = matrix
+            self.ids = meta['ids']
+            self._removed = set(meta['removed'])
+            self._rows = {item_id: row for row, item_id in enumerate(self.ids) if row not in self._removed}
@@ -0,0 +1,102 @@
+"""
+Single-flight cache for expensive computations (renders, searches, counts).
+
+Concurrent misses for the same key are coalesced: the first caller computes
+the value and everyone else arriving meanwhile waits for that result instead
+of repeating the work. Entries older than ``ttl`` stay servable for another
+``stale_ttl`` seconds; the first caller to see an expired entry recomputes
+it while concurrent callers get the stale value immediately.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Call:
+    """One in-flight computation that followers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.storable = True
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class SingleFlight:
+    """Bounded LRU cache where at most one caller computes a key at a time.
+
+    ``ttl=None`` keeps entries until ``invalidate()`` or eviction. A result
+    whose computation overlapped an ``invalidate()`` of its key is still
+    handed to the callers waiting on it, but is not stored.
+    """
+
+    def __init__(self, ttl=None, stale_ttl=0, max_entries=256, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._inflight = {}  # key -> _Call
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` at most once concurrently."""
+        with self._lock:
+            entry = self._entries.get(key)
+            call = self._inflight.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = self.clock() - stored_at
+                if self.ttl is None or age < self.ttl:
+                    self._entries.move_to_end(key)
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    if call is not None:
+                        return value
+                else:
+                    del self._entries[key]
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+        if not leader:
+            return call.wait()
+
+        try:
+            call.value = compute()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        else:
+            with self._lock:
+                if call.storable:
+                    self._entries[key] = (call.value, self.clock())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return call.value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def invalidate(self, predicate=None):
+        """Drop every entry (or those whose key matches ``predicate``)."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate is None or predicate(k)]:
+                del self._entries[key]
+            for key, call in self._inflight.items():
+                if predicate is None or predicate(key):
+                    call.storable = False
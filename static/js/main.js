@@ -537,12 +537,41 @@ function displaySearchResults(results, inputElement) {
     });
 }
 
+// "Load more" buttons on paginated listings append the next page's
+// server-rendered cards; the fragment response names the page after it.
+function initializeLoadMore() {
+    document.querySelectorAll('[data-load-more]').forEach(button => {
+        button.addEventListener('click', async () => {
+            const target = document.querySelector(button.dataset.target);
+            const originalText = button.innerHTML;
+            showLoading(button);
+            try {
+                const response = await fetch(button.dataset.loadMore);
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                target.insertAdjacentHTML('beforeend', await response.text());
+                const nextPage = response.headers.get('X-Next-Page');
+                if (nextPage) {
+                    button.dataset.loadMore = nextPage;
+                    hideLoading(button, originalText);
+                } else {
+                    button.parentElement.remove();
+                }
+            } catch (error) {
+                console.error('Load more error:', error);
+                hideLoading(button, originalText);
+                showMessage('Could not load more items', 'error');
+            }
+        });
+    });
+}
+
 // Initialize everything when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
     initializeFormValidation();
     initializeFileValidation();
     initializeAutoSave();
     initializeSearch();
+    initializeLoadMore();
     
     // Add hover effects to cards
     document.querySelectorAll('.program-card, .solution-card, .course-category, .job-card').forEach(card => {
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Archival tests: rows move to the archive tables, and ids freed by archival
+are never handed to new rows that would collide when archived in turn.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from app import (app, db, Event, EventArchive, Job, JobArchive, JOB_LISTING_DAYS, Registration,
+                 RegistrationArchive, archive_stale_rows)
+
+NOW = datetime(2000, 1, 1)  # before any sample data, so only these rows are stale
+
+
+def stale_job():
+    return Job(title='Archived Role', company='Oldco', location='Nairobi, Kenya', job_type='Full-time',
+               description='d', created_at=NOW - timedelta(days=JOB_LISTING_DAYS + 1))
+
+
+def past_event():
+    event = Event(title='Past Pitch', event_type='pitch', description='d', date=NOW - timedelta(days=1))
+    event.registrations.append(Registration(registration_type='attendee'))
+    return event
+
+
+def test_archive_reinsert_archive_again():
+    with app.app_context():
+        archived = {JobArchive: [], EventArchive: [], RegistrationArchive: []}
+        for _ in range(2):
+            job, event = stale_job(), past_event()
+            db.session.add_all([job, event])
+            db.session.commit()
+            archived[JobArchive].append(job.id)
+            archived[EventArchive].append(event.id)
+            archived[RegistrationArchive].append(event.registrations[0].id)
+            assert archive_stale_rows(now=NOW) == (1, 1)
+
+        for model, ids in archived.items():
+            assert len(set(ids)) == 2
+            assert db.session.query(model).filter(model.id.in_(ids)).count() == 2
+            db.session.query(model).filter(model.id.in_(ids)).delete()
+        db.session.commit()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+/api/batch tests: sub-requests run in order, and a malformed or failing
+entry is reported in its own slot without failing the rest.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, BATCH_MAX_REQUESTS
+
+
+def batch(requests):
+    return app.test_client().post('/api/batch', json={'requests': requests})
+
+
+def test_sub_requests_run_in_order():
+    response = batch([
+        {'id': 'stats', 'path': '/api/stats'},
+        {'path': '/api/solutions', 'params': {'per_page': 1}},
+    ])
+    assert response.status_code == 200
+    first, second = response.get_json()['responses']
+    assert (first['id'], first['status']) == ('stats', 200) and 'solutions' in first['body']
+    assert (second['id'], second['status']) == (1, 200)
+
+
+@pytest.mark.parametrize('entry', [
+    {'path': '/api/solutions', 'params': ['per_page', 1]},
+    {'path': '/api/solutions', 'params': 'per_page=1'},
+    {'path': 42},
+    {'path': '/solutions'},
+    {'path': '/api/batch'},
+    'not an object',
+])
+def test_malformed_entries_get_a_400_slot(entry):
+    responses = batch([entry, {'path': '/api/stats'}]).get_json()['responses']
+    assert [r['status'] for r in responses] == [400, 200]
+
+
+def test_failing_sub_request_gets_a_500_slot(monkeypatch):
+    def boom(**kwargs):
+        raise RuntimeError('boom')
+
+    monkeypatch.setitem(app.view_functions, 'api_solutions_trending', boom)
+    responses = batch([{'path': '/api/solutions/trending'}, {'path': '/api/stats'}]).get_json()['responses']
+    assert [r['status'] for r in responses] == [500, 200]
+    assert responses[0]['body'] == {'error': 'Internal server error'}
+
+
+@pytest.mark.parametrize('body', [{}, {'requests': []}, {'requests': {'path': '/api/stats'}},
+                                  {'requests': [{'path': '/api/stats'}] * (BATCH_MAX_REQUESTS + 1)}])
+def test_bad_batches_are_rejected(body):
+    assert app.test_client().post('/api/batch', json=body).status_code == 400
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Cross-process cache invalidation: a version bump made by another process
+resets this process's copy on the next sync; this process's own bumps don't.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+import app as app_module
+from app import app, db, CacheVersion, publish, shared_cache, sync_shared_caches
+
+resets = []
+
+
+@shared_cache('test-cache')
+def _reset_test_cache():
+    resets.append(1)
+
+
+@pytest.fixture
+def channel():
+    with app.app_context():
+        if db.session.get(CacheVersion, 'test-cache') is None:
+            db.session.add(CacheVersion(name='test-cache', version=0))
+            db.session.commit()
+        sync_shared_caches(force=True)
+        resets.clear()
+        yield
+
+
+def bump_from_another_process():
+    db.session.execute(db.update(CacheVersion).where(CacheVersion.name == 'test-cache')
+                       .values(version=CacheVersion.version + 1))
+    db.session.commit()
+
+
+def test_remote_bump_resets_on_next_sync(channel):
+    bump_from_another_process()
+    sync_shared_caches(force=True)
+    assert resets == [1]
+    sync_shared_caches(force=True)
+    assert resets == [1]
+
+
+def test_own_publish_does_not_reset(channel):
+    publish('test-cache')
+    app_module._flush_published()
+    sync_shared_caches(force=True)
+    assert resets == []
+
+
+def test_own_publish_after_unseen_remote_bump_still_resets(channel):
+    bump_from_another_process()
+    publish('test-cache')
+    app_module._flush_published()
+    sync_shared_caches(force=True)
+    assert resets == [1]
+
+
+def test_sync_is_throttled(channel):
+    bump_from_another_process()
+    sync_shared_caches()  # within CACHE_SYNC_INTERVAL of the fixture's sync
+    assert resets == []
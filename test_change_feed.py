@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+?since= change feed tests: paging with deletes in between, and token parsing.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+import app as app_module
+from app import app, db, Solution, Tombstone, sync_token
+
+BASE = datetime(2020, 1, 1)
+
+
+@pytest.fixture
+def changed_solutions(monkeypatch):
+    monkeypatch.setattr(app_module, 'SYNC_PAGE_SIZE', 3)
+    with app.app_context():
+        rows = [Solution(title=f'Feed {i}', description='d', category='AI/ML', stage='MVP',
+                         funding_status='Seeking', updated_at=BASE + timedelta(minutes=i))
+                for i in range(11)]
+        db.session.add_all(rows)
+        db.session.add(Tombstone(resource='solution', item_id=999999, deleted_at=BASE + timedelta(hours=1)))
+        db.session.commit()
+        ids = [row.id for row in rows]
+    yield ids
+    with app.app_context():
+        Tombstone.query.filter_by(item_id=999999).delete()
+        Solution.query.filter(Solution.id.in_(ids)).delete()
+        db.session.commit()
+
+
+def test_paging_delivers_every_row_around_a_later_delete(changed_solutions):
+    client = app.test_client()
+    token = sync_token((BASE - timedelta(seconds=1), 0))
+    seen, deleted = [], set()
+    for _ in range(20):
+        body = client.get('/api/solutions', query_string={'since': token}).get_json()
+        seen.extend(change['id'] for change in body['changes'])
+        deleted.update(body['deleted'])
+        token = body['token']
+        if not body['has_more']:
+            break
+    assert set(changed_solutions) <= set(seen)
+    assert 999999 in deleted
+
+
+@pytest.mark.parametrize('token, status', [
+    ('2020-01-01T00:00:00+00:00_0', 200),
+    ('2020-01-01T03:00:00+03:00_0', 200),
+    ('not-a-date_0', 400),
+    ('2020-01-01T00:00:00_x', 400),
+])
+def test_since_token_parsing(token, status):
+    assert app.test_client().get('/api/solutions', query_string={'since': token}).status_code == status
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Engagement rollup tests: compaction into hourly/daily buckets, overlapping
+aggregators, and zero-filled /analytics series.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+from sqlalchemy import event
+
+from app import (app, db, EngagementEvent, Solution, SolutionDailyStats, SolutionHourlyStats,
+                 compact_engagement)
+
+HOUR = datetime(2024, 3, 5, 14)
+
+
+@pytest.fixture
+def solution_id():
+    with app.app_context():
+        row = Solution(title='Rolled Up', description='d', category='AI/ML', stage='MVP', funding_status='Seeking')
+        db.session.add(row)
+        db.session.commit()
+        yield row.id
+        for model in (EngagementEvent, SolutionHourlyStats, SolutionDailyStats):
+            model.query.filter_by(solution_id=row.id).delete()
+        db.session.delete(row)
+        db.session.commit()
+
+
+def log(solution_id, *events):
+    db.session.add_all(EngagementEvent(solution_id=solution_id, kind=kind, created_at=at) for kind, at in events)
+    db.session.commit()
+
+
+def rollup(model, solution_id, start):
+    row = db.session.get(model, (solution_id, start))
+    return row.views, row.purchases
+
+
+def test_compaction_folds_events_into_rollups(solution_id):
+    with app.app_context():
+        log(solution_id, ('view', HOUR), ('view', HOUR + timedelta(minutes=59)),
+            ('purchase', HOUR + timedelta(minutes=5)), ('view', HOUR + timedelta(hours=2)))
+        compact_engagement(batch_size=3)
+        log(solution_id, ('view', HOUR + timedelta(minutes=30)))
+        compact_engagement()
+        assert EngagementEvent.query.filter_by(solution_id=solution_id).count() == 0
+        assert rollup(SolutionHourlyStats, solution_id, HOUR) == (3, 1)
+        assert rollup(SolutionHourlyStats, solution_id, HOUR + timedelta(hours=2)) == (1, 0)
+        assert rollup(SolutionDailyStats, solution_id, HOUR.replace(hour=0)) == (4, 1)
+
+
+def test_overlapping_run_does_not_double_count(solution_id):
+    with app.app_context():
+        log(solution_id, ('view', HOUR))
+        compact_engagement()
+        log(solution_id, ('view', HOUR), ('view', HOUR))
+        victim = EngagementEvent.query.filter_by(solution_id=solution_id).first().id
+        engine = db.engine
+        raced = []
+
+        # Another aggregator folds one of the events between our read and our delete.
+        def other_run(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('DELETE FROM engagement_event') and not raced:
+                raced.append(1)
+                cursor.execute('DELETE FROM engagement_event WHERE id = ?', (victim,))
+                cursor.execute('UPDATE solution_hourly_stats SET views = views + 1 WHERE solution_id = ?',
+                               (solution_id,))
+
+        event.listen(engine, 'before_cursor_execute', other_run)
+        try:
+            compact_engagement()
+        finally:
+            event.remove(engine, 'before_cursor_execute', other_run)
+        assert raced
+        assert rollup(SolutionHourlyStats, solution_id, HOUR)[0] == 3
+
+
+def test_analytics_zero_fills_missing_buckets(solution_id):
+    with app.app_context():
+        log(solution_id, ('view', HOUR), ('purchase', HOUR + timedelta(hours=2)))
+        compact_engagement()
+    response = app.test_client().get(f'/api/solution/{solution_id}/analytics', query_string={
+        'granularity': 'hour', 'start': HOUR.isoformat(), 'end': (HOUR + timedelta(hours=3)).isoformat()
+    })
+    series = [(b['views'], b['purchases']) for b in response.get_json()['buckets']]
+    assert series == [(1, 0), (0, 0), (0, 1), (0, 0)]
+
+
+@pytest.mark.parametrize('query', [
+    {'granularity': 'week'},
+    {'start': 'yesterday'},
+    {'granularity': 'hour', 'start': '2024-01-01T00:00:00', 'end': '2024-06-01T00:00:00'},
+])
+def test_analytics_rejects_bad_ranges(solution_id, query):
+    assert app.test_client().get(f'/api/solution/{solution_id}/analytics', query_string=query).status_code == 400
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Admin export tests: access control, CSV/NDJSON streaming and date filters.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, db, PitchApplication, User
+
+URL = '/api/admin/export/pitch-applications'
+
+
+@pytest.fixture
+def admin_client():
+    with app.app_context():
+        admin_id = User.query.filter_by(role='admin').first().id
+        rows = [PitchApplication(company_name=f'Export Co {i}', founder_name='F', email='f@example.com',
+                                 company_stage='Seed', industry='AI', status=status,
+                                 created_at=datetime(2024, 1, day))
+                for i, (status, day) in enumerate([('pending', 1), ('approved', 10), ('pending', 20)])]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [row.id for row in rows]
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = admin_id
+    yield client
+    with app.app_context():
+        PitchApplication.query.filter(PitchApplication.id.in_(ids)).delete()
+        db.session.commit()
+
+
+def exported(response):
+    return [row['company_name'] for row in csv.DictReader(io.StringIO(response.get_data(as_text=True)))
+            if row['company_name'].startswith('Export Co')]
+
+
+def test_requires_an_admin():
+    assert app.test_client().get(URL).status_code == 403
+
+
+def test_csv_export_filters_by_status_and_dates(admin_client):
+    response = admin_client.get(URL)
+    assert response.mimetype == 'text/csv'
+    assert 'pitch-applications.csv' in response.headers['Content-Disposition']
+    assert exported(response) == ['Export Co 0', 'Export Co 1', 'Export Co 2']
+    assert exported(admin_client.get(URL, query_string={'status': 'pending'})) == ['Export Co 0', 'Export Co 2']
+    assert exported(admin_client.get(URL, query_string={
+        'since': '2024-01-05T00:00:00+00:00', 'until': '2024-01-20T03:00:00+03:00'
+    })) == ['Export Co 1']
+
+
+def test_ndjson_export(admin_client):
+    response = admin_client.get(URL, query_string={'format': 'ndjson', 'since': '2024-01-15'})
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    mine = [row for row in rows if row['company_name'].startswith('Export Co')]
+    assert [(row['company_name'], row['created_at']) for row in mine] == [('Export Co 2', '2024-01-20T00:00:00')]
+
+
+def test_bad_dates_are_rejected(admin_client):
+    assert admin_client.get(URL, query_string={'since': 'last week'}).status_code == 400
+    assert admin_client.get('/api/admin/export/registrations', query_string={'until': '2024-13-01'}).status_code == 400
+
+
+def test_registration_export_joins_event_and_user(admin_client):
+    response = admin_client.get('/api/admin/export/registrations')
+    assert response.status_code == 200
+    header = next(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert header[-3:] == ['event_title', 'user_name', 'user_email']
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Facet count tests: boolean and joined (location token) dimensions, and
+which writes invalidate the cached counts.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+import app as app_module
+from app import app, db, Job, Solution
+
+LOCATIONS = [('Nairobi, Kenya', False), ('nairobi', True), ('NAIROBI,  Kenya', True), ('Lagos, Nigeria', False)]
+
+
+@pytest.fixture
+def jobs():
+    with app.app_context():
+        rows = [Job(title=f'Facet job {i}', company='Facet Co', location=location, remote=remote,
+                    job_type='Facet-type', description='d')
+                for i, (location, remote) in enumerate(LOCATIONS)]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [row.id for row in rows]
+    yield ids
+    with app.app_context():
+        for job in Job.query.filter(Job.id.in_(ids)):
+            db.session.delete(job)
+        db.session.commit()
+
+
+def facets(**params):
+    return app.test_client().get('/api/facets/hiring', query_string=dict(params, type='Facet-type')).get_json()['facets']
+
+
+def test_remote_false_selects_onsite_jobs(jobs):
+    assert facets()['remote'] == {'true': 2, 'false': 2}
+    assert facets(remote='false')['location']['lagos'] == 1
+    assert 'lagos' not in facets(remote='true')['location']
+
+
+def test_location_counts_normalized_tokens(jobs):
+    location = facets()['location']
+    assert location['nairobi'] == 3
+    assert location['kenya'] == 2
+    assert 'Nairobi, Kenya' not in location
+    # Selecting a bucket returns exactly the jobs it counted.
+    assert sum(facets(location='nairobi')['remote'].values()) == 3
+
+
+def test_counter_updates_keep_cached_counts(jobs):
+    with app.app_context():
+        app_module.facet_counts('solutions', {})
+        solution = Solution.query.first()
+        solution.views += 1
+        db.session.commit()
+        assert len([k for k in app_module._facet_cache._entries if k[0] == 'solutions']) == 1
+        solution.stage = 'Scaling'
+        db.session.commit()
+        assert not [k for k in app_module._facet_cache._entries if k[0] == 'solutions']
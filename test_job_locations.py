@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Job location index tests: token parsing, prefix search, and the backfill
+migration for jobs written before the index existed.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+from alembic import command as alembic_command
+
+from app import app, db, migrate, Job, JobLocation, job_location_clause, location_tokens
+
+
+@pytest.mark.parametrize('location, remote, tokens', [
+    ('Nairobi, Kenya', False, {('city', 'nairobi'), ('country', 'kenya')}),
+    ('San Francisco, CA, USA', False, {('city', 'san francisco'), ('region', 'ca'), ('country', 'usa')}),
+    ('Remote', False, {('remote', 'remote')}),
+    ('Lagos,  Nigeria (Hybrid)', True, {('remote', 'remote'), ('city', 'lagos'), ('country', 'nigeria hybrid')}),
+    ('', False, set()),
+])
+def test_location_tokens(location, remote, tokens):
+    assert location_tokens(location, remote) == tokens
+
+
+@pytest.fixture
+def jobs():
+    with app.app_context():
+        rows = [Job(title='Locator', company='Mapco', location=location, job_type='Full-time', description='d')
+                for location in ('Nairobi, Kenya', 'Nakuru, Kenya', 'Kampala, Uganda')]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [row.id for row in rows]
+        yield ids
+        for job_id in ids:
+            db.session.delete(db.session.get(Job, job_id))
+        db.session.commit()
+
+
+def matching(ids, query):
+    return set(db.session.scalars(db.select(Job.id).where(Job.id.in_(ids), job_location_clause(query))))
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('nair', [0]),
+    ('na', [0, 1]),
+    ('KENYA', [0, 1]),
+    ('nakuru, ken', [1]),
+    ('kenya uganda', []),
+    ('obi', []),  # prefixes only
+])
+def test_prefix_matching(jobs, query, expected):
+    with app.app_context():
+        assert matching(jobs, query) == {jobs[i] for i in expected}
+
+
+def test_location_edit_reindexes(jobs):
+    with app.app_context():
+        db.session.get(Job, jobs[2]).location = 'Kigali, Rwanda'
+        db.session.commit()
+        assert matching(jobs, 'kigali') == {jobs[2]}
+        assert matching(jobs, 'kampala') == set()
+
+
+def test_backfill_migration_indexes_jobs_without_tokens(jobs):
+    with app.app_context():
+        JobLocation.query.filter(JobLocation.job_id.in_(jobs[:2])).delete()
+        db.session.commit()
+        assert matching(jobs, 'kenya') == set()
+        config = migrate.get_config()
+        config.attributes['configure_logger'] = False
+        alembic_command.downgrade(config, '7b2e4c1f9a30')
+        alembic_command.upgrade(config, 'head')
+        assert matching(jobs, 'kenya') == {jobs[0], jobs[1]}
+        assert JobLocation.query.filter_by(job_id=jobs[2]).count() == 2
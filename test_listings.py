@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Listing page tests: "load more" fragments, their X-Next-Page links, and the
+job count shown on /hiring.
+"""
+
+import os
+import re
+from urllib.parse import parse_qs, urlsplit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, db, Course, Job, Solution
+
+PER_PAGE = app.config.get('POSTS_PER_PAGE', 20)
+
+
+@pytest.fixture
+def listed():
+    with app.app_context():
+        rows = [Solution(title=f'Listed {i}', description='d', category='Listing Test', stage='MVP',
+                         funding_status='Seeking') for i in range(PER_PAGE + 5)]
+        rows += [Job(title=f'Listed job {i}', company='Pagerco', location='Nairobi, Kenya', job_type='Listing Test',
+                     description='d', remote=i % 2 == 0) for i in range(6)]
+        rows += [Course(title='Listed course', description='d', category='Listing Test', instructor='I',
+                        duration='1 week', level='Beginner')]
+        db.session.add_all(rows)
+        db.session.commit()
+        keys = [(type(row), row.id) for row in rows]
+        yield
+        for model, row_id in keys:
+            row = db.session.get(model, row_id)
+            if row is not None:
+                db.session.delete(row)
+        db.session.commit()
+
+
+def cards(response, kind):
+    return len(re.findall(rf'class="{kind}-card\b', response.get_data(as_text=True)))
+
+
+def test_fragments_page_through_filtered_results(listed):
+    client = app.test_client()
+    first = client.get('/solutions/items', query_string={'category': 'Listing Test'})
+    assert first.status_code == 200 and cards(first, 'solution') == PER_PAGE
+    next_page = urlsplit(first.headers['X-Next-Page'])
+    assert next_page.path == '/solutions/items'
+    assert parse_qs(next_page.query) == {'category': ['Listing Test'], 'page': ['2']}
+
+    second = client.get(first.headers['X-Next-Page'])
+    assert cards(second, 'solution') == 5
+    assert 'X-Next-Page' not in second.headers
+
+
+@pytest.mark.parametrize('url, query, kind, count', [
+    ('/hiring/items', {'type': 'Listing Test', 'remote': 'false'}, 'job', 3),
+    ('/hiring/items', {'type': 'Listing Test', 'remote': 'true'}, 'job', 3),
+    ('/learn/items', {'category': 'Listing Test'}, 'course', 1),
+])
+def test_fragments_apply_filters(listed, url, query, kind, count):
+    response = app.test_client().get(url, query_string=query)
+    assert cards(response, kind) == count
+    assert 'X-Next-Page' not in response.headers
+
+
+def test_hiring_job_count_follows_inserts_and_deletes(listed):
+    client = app.test_client()
+    with app.app_context():
+        total = Job.query.count()
+        assert f'<h3>{total}</h3>' in client.get('/hiring').get_data(as_text=True)
+        job = Job.query.filter_by(job_type='Listing Test').first()
+        db.session.delete(job)
+        db.session.commit()
+    assert f'<h3>{total - 1}</h3>' in client.get('/hiring').get_data(as_text=True)
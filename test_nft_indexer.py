@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+NFT indexer tests against an in-process JSON-RPC stub node.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, db, IndexerCheckpoint, NftToken, Solution, run_nft_indexer
+from nft_indexer import SOLUTION_MINTED, SOLUTION_PURCHASED, JsonRpcClient, RpcError, decode_log, scan
+
+CONTRACT = '0x' + 'ab' * 20
+ALICE = '0x' + '11' * 20
+BOB = '0x' + '22' * 20
+
+
+def word(value):
+    return value.to_bytes(32, 'big')
+
+
+def topic(value):
+    if isinstance(value, str):
+        return '0x' + value[2:].rjust(64, '0')
+    return '0x' + word(value).hex()
+
+
+def encode_string(text):
+    raw = text.encode()
+    return word(len(raw)) + raw.ljust((len(raw) + 31) // 32 * 32, b'\0')
+
+
+def minted_log(block, token_id, creator, title, price=10 ** 17, uri='ipfs://QmTest'):
+    title_part, uri_part = encode_string(title), encode_string(uri)
+    head = word(128) + word(1) + word(price) + word(128 + len(title_part))
+    return {
+        'blockNumber': hex(block), 'logIndex': '0x0', 'transactionHash': '0x' + '00' * 32,
+        'topics': [SOLUTION_MINTED, topic(token_id), topic(creator)],
+        'data': '0x' + (head + title_part + uri_part).hex(),
+    }
+
+
+def purchased_log(block, token_id, buyer, seller, index=1):
+    return {
+        'blockNumber': hex(block), 'logIndex': hex(index), 'transactionHash': '0x' + '00' * 32,
+        'topics': [SOLUTION_PURCHASED, topic(token_id), topic(buyer), topic(seller)],
+        'data': '0x' + word(10 ** 17).hex(),
+    }
+
+
+class StubNode:
+    """Serves eth_blockNumber/eth_getLogs from a fixed list of logs."""
+
+    def __init__(self, logs, head, max_range=None):
+        self.logs = logs
+        self.head = head
+        self.max_range = max_range
+        self.calls = []
+
+    def __call__(self, payload):
+        method, params = payload['method'], payload['params']
+        self.calls.append(method)
+        if method == 'eth_blockNumber':
+            return {'id': payload['id'], 'result': hex(self.head)}
+        start, end = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+        if self.max_range and end - start + 1 > self.max_range:
+            return {'id': payload['id'], 'error': {'message': 'query returned more than 10000 results'}}
+        return {'id': payload['id'], 'result': [
+            log for log in self.logs if start <= int(log['blockNumber'], 16) <= end
+        ]}
+
+
+@pytest.fixture
+def solutions():
+    with app.app_context():
+        db.session.query(IndexerCheckpoint).delete()
+        db.session.query(NftToken).delete()
+        rows = [Solution(title=title, description='d', category='AI/ML', stage='MVP', funding_status='Seeking')
+                for title in ('Indexer Alpha', 'Indexer Beta')]
+        db.session.add_all(rows)
+        db.session.commit()
+        yield [row.id for row in rows]
+        db.session.query(NftToken).delete()
+        Solution.query.filter(Solution.id.in_([row.id for row in rows])).delete()
+        db.session.commit()
+
+
+def test_decode_minted_log():
+    event = decode_log(minted_log(5, 7, ALICE, 'Indexer Alpha'))
+    assert event['event'] == 'minted'
+    assert (event['token_id'], event['creator'], event['title']) == (7, ALICE, 'Indexer Alpha')
+    assert event['ipfs_uri'] == 'ipfs://QmTest'
+
+
+def test_indexer_links_tokens_and_counts_purchases(solutions):
+    node = StubNode([
+        minted_log(10, 1, ALICE, 'Indexer Alpha'),
+        minted_log(12, 2, ALICE, 'Indexer Beta'),
+        purchased_log(20, 1, BOB, ALICE),
+        purchased_log(35, 1, ALICE, BOB),
+    ], head=46)
+    client = JsonRpcClient(transport=node)
+    with app.app_context():
+        last_block, applied = run_nft_indexer(client, CONTRACT, batch_size=10, confirmations=6)
+        assert (last_block, applied) == (40, 4)
+        alpha, beta = (db.session.get(Solution, i) for i in solutions)
+        assert (alpha.nft_token_id, alpha.purchases) == ('1', 2)
+        assert (beta.nft_token_id, beta.purchases) == ('2', 0)
+        assert db.session.get(NftToken, 1).owner_address == ALICE
+        assert db.session.get(IndexerCheckpoint, 'solutions-marketplace').block_number == 40
+
+        # Resuming from the checkpoint only scans new blocks.
+        node.logs.append(purchased_log(44, 2, BOB, ALICE))
+        node.head = 50
+        assert run_nft_indexer(client, CONTRACT, batch_size=10, confirmations=6) == (44, 1)
+        assert db.session.get(Solution, solutions[1]).purchases == 1
+
+
+def test_indexer_splits_ranges_the_node_rejects(solutions):
+    node = StubNode([minted_log(3, 1, ALICE, 'Indexer Alpha')], head=16, max_range=4)
+    with app.app_context():
+        assert run_nft_indexer(JsonRpcClient(transport=node), CONTRACT, batch_size=16, confirmations=0) == (16, 1)
+        assert db.session.get(Solution, solutions[0]).nft_token_id == '1'
+
+
+def test_indexer_skips_tokens_whose_solution_was_deleted(solutions):
+    node = StubNode([minted_log(5, 1, ALICE, 'Indexer Alpha')], head=10)
+    client = JsonRpcClient(transport=node)
+    with app.app_context():
+        run_nft_indexer(client, CONTRACT, batch_size=10, confirmations=0)
+        db.session.delete(db.session.get(Solution, solutions[0]))
+        db.session.commit()
+        node.logs.append(purchased_log(12, 1, BOB, ALICE))
+        node.head = 20
+        assert run_nft_indexer(client, CONTRACT, batch_size=10, confirmations=0) == (20, 1)
+        assert db.session.get(NftToken, 1).purchases == 1
+
+
+def test_scan_gives_up_when_a_single_block_fails():
+    node = StubNode([], head=8, max_range=-1)
+    with pytest.raises(RpcError):
+        list(scan(JsonRpcClient(transport=node), CONTRACT, 0, 7, batch_size=8))
+    assert node.calls.count('eth_getLogs') == 4  # 8, 4, 2, 1 blocks
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Query-count regression tests for list endpoints and pages.
+Fails when a request issues more SQL statements than its budget, which is
+how N+1 loading of creators, employers or attendees shows up.
+"""
+
+import os
+from contextlib import contextmanager
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import pytest
+from sqlalchemy import event
+
+from app import app, db, job_count, sync_shared_caches, Event, Job, Registration, Solution, User
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """Fail if more than ``limit`` SQL statements run inside the block."""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+        # The once-a-second cache version check is not part of any budget.
+        sync_shared_caches(force=True)
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert len(statements) <= limit, (
+        f'{len(statements)} queries executed, expected at most {limit}:\n' + '\n'.join(statements)
+    )
+
+
+@pytest.fixture(scope='module')
+def client():
+    with app.app_context():
+        users = [User(name=f'User {i}', email=f'user{i}@example.com') for i in range(10)]
+        db.session.add_all(users)
+        db.session.flush()
+        event_row = Event.query.first()
+        for user in users:
+            db.session.add(Solution(title=f'Solution by {user.name}', description='d', category='AI/ML',
+                                    stage='MVP', funding_status='Seeking', creator_id=user.id))
+            db.session.add(Job(title=f'Job by {user.name}', company='Co', location='Nairobi, Kenya',
+                               job_type='Full-time', description='d', employer_id=user.id))
+            db.session.add(Registration(event_id=event_row.id, user_id=user.id))
+        admin = User.query.filter_by(role='admin').first()
+        db.session.commit()
+        event_id, admin_id = event_row.id, admin.id
+        sync_shared_caches(force=True)
+        job_count()  # primed by warm_up() in production
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = admin_id
+    client.event_id = event_id
+    return client
+
+
+@pytest.mark.parametrize('url, limit', [
+    ('/api/solutions', 2),
+    ('/api/jobs', 2),
+    ('/api/jobs?include_archived=1', 3),
+    ('/solutions', 2),
+    ('/hiring', 2),
+])
+def test_list_queries_are_bounded(client, url, limit):
+    with assert_max_queries(limit):
+        response = client.get(url)
+        response.get_data()  # listing pages stream; render them inside the block
+    assert response.status_code == 200
+
+
+def test_hiring_shows_total_job_count(client):
+    with app.app_context():
+        db.session.add_all([Job(title=f'Extra job {i}', company='Co', location='Remote', job_type='Contract',
+                                description='d') for i in range(15)])
+        db.session.commit()
+        total = Job.query.count()
+    assert total > app.config.get('POSTS_PER_PAGE', 20)
+    assert f'<h3>{total}</h3>' in client.get('/hiring').get_data(as_text=True)
+
+
+def test_creator_and_employer_summaries(client):
+    solutions = client.get('/api/solutions').get_json()
+    assert any(s['creator'] and s['creator']['name'] == 'User 3' for s in solutions)
+    jobs = client.get('/api/jobs').get_json()
+    assert any(j['employer'] and j['employer']['name'] == 'User 3' for j in jobs)
+
+
+def test_attendee_list_queries_are_bounded(client):
+    with assert_max_queries(4):
+        response = client.get(f'/api/event/{client.event_id}/attendees')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 10
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Upcoming-events schedule tests: ordering, expiry by bisect, trimming and rebuilds.
+"""
+
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from app import app, db, CacheVersion, Event, event_schedule, sync_shared_caches
+from schedule import EventSchedule
+
+NOW = datetime(2030, 1, 1)
+
+
+def event(id, hours, event_type='webinar'):
+    return SimpleNamespace(id=id, date=NOW + timedelta(hours=hours), event_type=event_type)
+
+
+def test_upcoming_merges_types_soonest_first():
+    schedule = EventSchedule(lambda: [event(1, 5), event(2, 1, 'pitch'), event(3, 3), event(4, 2, 'workshop')])
+    assert [e.id for e in schedule.upcoming(now=NOW)] == [2, 4, 3, 1]
+    assert [e.id for e in schedule.upcoming(['webinar', 'pitch'], limit=2, now=NOW)] == [2, 3]
+    assert schedule.count(['webinar'], now=NOW + timedelta(hours=4)) == 1
+
+
+def test_loader_runs_once_per_invalidation():
+    calls = []
+    schedule = EventSchedule(lambda: calls.append(1) or [event(1, 1)])
+    schedule.upcoming(now=NOW)
+    schedule.count(now=NOW)
+    assert calls == [1]
+    schedule.invalidate()
+    schedule.invalidate()
+    schedule.upcoming(now=NOW)
+    assert calls == [1, 1]
+
+
+def test_past_events_are_trimmed_once_they_dominate_a_bucket():
+    schedule = EventSchedule(lambda: [event(i, i) for i in range(1, 5)])
+    assert [e.id for e in schedule.upcoming(now=NOW + timedelta(hours=3))] == [4]
+    dates, events = schedule._buckets['webinar']
+    assert [e.id for e in events] == [4]
+
+
+def test_trim_skips_a_bucket_rebuilt_after_it_was_read():
+    loaded = [[event(i, i) for i in range(1, 5)], [event(9, 10)]]
+    schedule = EventSchedule(lambda: loaded.pop(0))
+    stale_dates, _ = schedule._current()['webinar']
+    schedule.invalidate()
+    schedule._current()
+    schedule._trim('webinar', stale_dates, 3)
+    assert [e.id for e in schedule.upcoming(now=NOW)] == [9]
+
+
+def test_write_in_another_process_reloads_the_schedule():
+    with app.app_context():
+        sync_shared_caches(force=True)
+        event_schedule.upcoming()
+        row = Event(title='Remote Webinar', event_type='webinar', description='d',
+                    date=datetime.utcnow() + timedelta(days=3))
+        db.session.add(row)
+        db.session.commit()
+        try:
+            db.session.execute(db.update(Event).where(Event.id == row.id).values(title='Renamed elsewhere'))
+            db.session.execute(db.update(CacheVersion).where(CacheVersion.name == 'schedule')
+                               .values(version=CacheVersion.version + 1))
+            db.session.commit()
+            sync_shared_caches(force=True)
+            titles = {e.id: e.title for e in event_schedule.upcoming(['webinar'])}
+            assert titles[row.id] == 'Renamed elsewhere'
+        finally:
+            Event.query.filter_by(id=row.id).delete()
+            db.session.commit()
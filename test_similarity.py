@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+TF-IDF similarity tests: ranking, incremental updates, snapshots, the
+/similar limit, and catching up with another process's writes.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, db, CacheVersion, Solution, ensure_similarity, sync_shared_caches
+from similarity import TfidfIndex
+
+DOCS = [
+    (1, 'solar panel inverter for rural clinics'),
+    (2, 'solar battery storage for clinics'),
+    (3, 'mobile money savings app'),
+]
+
+
+def test_query_ranks_by_shared_terms():
+    index = TfidfIndex()
+    index.build(DOCS)
+    assert {i for i, _ in index.query('solar clinics', k=2)} == {1, 2}
+    assert index.query('solar clinics', k=5, exclude=1)[0][0] == 2
+    assert index.query('unrelated words', k=5) == []
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_non_positive_k_returns_nothing(k):
+    index = TfidfIndex()
+    index.build(DOCS)
+    assert index.query('solar', k=k) == []
+
+
+def test_add_replaces_and_remove_masks():
+    index = TfidfIndex()
+    index.build(DOCS)
+    index.add(3, 'solar water pump')
+    index.add(4, 'mobile money wallet')
+    assert 3 in [i for i, _ in index.query('solar', k=5)]
+    assert [i for i, _ in index.query('mobile money', k=5)] == [4]
+    index.remove(1)
+    assert 1 not in [i for i, _ in index.query('solar', k=5)]
+
+
+def test_snapshot_round_trip(tmp_path):
+    index = TfidfIndex()
+    index.build(DOCS)
+    index.add(4, 'solar lanterns')
+    index.remove(3)
+    index.save(str(tmp_path))
+    loaded = TfidfIndex()
+    loaded.load(str(tmp_path))
+    assert len(loaded) == 3 and 3 not in loaded
+    assert loaded.query('solar lanterns', k=1) == index.query('solar lanterns', k=1)
+
+
+@pytest.fixture
+def solutions():
+    with app.app_context():
+        rows = [Solution(title=title, description='similarity fixture', category='Energy', stage='MVP',
+                         funding_status='Seeking') for title in ('Solar Microgrid', 'Solar Kiosk', 'Grain Dryer')]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [row.id for row in rows]
+        yield ids
+        for solution_id in ids:
+            db.session.delete(db.session.get(Solution, solution_id))
+        db.session.commit()
+
+
+def test_similar_limit_is_clamped(solutions):
+    client = app.test_client()
+    response = client.get(f'/api/solution/{solutions[0]}/similar', query_string={'limit': -3})
+    assert response.status_code == 200 and len(response.get_json()) <= 1
+
+
+def test_catches_up_with_another_process_edit(solutions):
+    with app.app_context():
+        sync_shared_caches(force=True)
+        index = ensure_similarity(Solution)
+        assert index.query('grain dryer', k=1)[0][0] == solutions[2]
+        # Another worker rewrites the text: only the version row tells us.
+        db.session.execute(db.update(Solution).where(Solution.id == solutions[2])
+                           .values(title='Cassava Grater', updated_at=db.func.now()))
+        db.session.execute(db.update(CacheVersion).where(CacheVersion.name == 'similarity:solution')
+                           .values(version=CacheVersion.version + 1))
+        db.session.commit()
+        sync_shared_caches(force=True)
+        index = ensure_similarity(Solution)
+        assert index.query('cassava grater', k=1)[0][0] == solutions[2]
+        assert solutions[2] not in [i for i, _ in index.query('grain dryer', k=5)]
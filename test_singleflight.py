@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Single-flight cache tests: coalescing, stale-while-revalidate and invalidation.
+"""
+
+import os
+import threading
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, db, CacheVersion, sync_shared_caches, solutions_fragment
+from singleflight import SingleFlight
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_misses_compute_once():
+    cache = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return 'value'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get('k', compute)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(cache.get('k', compute))) for _ in range(8)]
+    for t in followers:
+        t.start()
+    release.set()
+    for t in [leader] + followers:
+        t.join()
+    assert calls == [1]
+    assert results == ['value'] * 9
+
+
+def test_expired_entry_is_served_stale_while_one_caller_refreshes():
+    clock = Clock()
+    cache = SingleFlight(ttl=10, stale_ttl=60, clock=clock)
+    cache.get('k', lambda: 'old')
+    clock.now = 15
+    started, release = threading.Event(), threading.Event()
+
+    def refresh():
+        started.set()
+        release.wait()
+        return 'new'
+
+    refresher = threading.Thread(target=cache.get, args=('k', refresh))
+    refresher.start()
+    started.wait()
+    assert cache.get('k', lambda: pytest.fail('second refresh')) == 'old'
+    release.set()
+    refresher.join()
+    assert cache.get('k', lambda: pytest.fail('entry should be fresh')) == 'new'
+
+    clock.now = 100  # past ttl + stale_ttl: a plain miss
+    assert cache.get('k', lambda: 'newest') == 'newest'
+
+
+def test_invalidate_during_compute_does_not_store_result():
+    cache = SingleFlight()
+
+    def compute():
+        cache.invalidate(lambda key: key == 'k')
+        return 'computed before the write'
+
+    assert cache.get('k', compute) == 'computed before the write'
+    assert 'k' not in cache
+
+
+def test_errors_are_not_cached():
+    cache = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        cache.get('k', fail)
+    assert cache.get('k', lambda: 'ok') == 'ok'
+
+
+def test_lru_eviction():
+    cache = SingleFlight(max_entries=2)
+    for key in 'abc':
+        cache.get(key, lambda: key)
+    assert 'a' not in cache and len(cache) == 2
+
+
+def test_streamed_pages_are_not_buffered():
+    response = app.test_client().get('/solutions')
+    assert response.is_streamed
+
+
+def test_another_process_write_drops_cached_fragments():
+    client = app.test_client()
+    with app.app_context():
+        sync_shared_caches(force=True)
+        client.get('/solutions/items')
+        assert len(solutions_fragment.cache) == 1
+        db.session.execute(db.update(CacheVersion).where(CacheVersion.name == 'response:solutions_fragment')
+                           .values(version=CacheVersion.version + 1))
+        db.session.commit()
+        sync_shared_caches(force=True)
+        assert len(solutions_fragment.cache) == 0
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Trending ranking tests: decay, the /api/solutions/trending limit, and picking
+up engagement logged by other processes exactly once.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+import app as app_module
+from app import (app, db, EngagementEvent, Solution, TRENDING_SYNC_INTERVAL, compact_engagement,
+                 ensure_trending, trending_solutions)
+from trending import TrendingRanking
+
+
+def test_recent_engagement_outranks_older_engagement():
+    ranking = TrendingRanking(half_life=10, epoch=0)
+    ranking.record('old', 4, at=0)
+    ranking.record('new', 1, at=25)  # 4 halved 2.5 times is ~0.71
+    assert [item for item, _ in ranking.top(2, now=25)] == ['new', 'old']
+    assert ranking.top(1, now=35)[0][1] == pytest.approx(0.5)
+    ranking.discard('new')
+    assert [item for item, _ in ranking.top(5)] == ['old']
+
+
+@pytest.fixture
+def solutions():
+    with app.app_context():
+        rows = [Solution(title=f'Trending {i}', description='d', category='AI/ML', stage='MVP',
+                         funding_status='Seeking') for i in range(2)]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [row.id for row in rows]
+        ensure_trending()
+        yield ids
+        EngagementEvent.query.filter(EngagementEvent.solution_id.in_(ids)).delete()
+        Solution.query.filter(Solution.id.in_(ids)).delete()
+        db.session.commit()
+        for solution_id in ids:
+            trending_solutions.discard(solution_id)
+
+
+def score(solution_id):
+    return dict(trending_solutions.top(len(trending_solutions))).get(solution_id, 0)
+
+
+def test_negative_limit_returns_one_solution(solutions):
+    client = app.test_client()
+    for solution_id in solutions:
+        client.post(f'/api/solution/{solution_id}/purchase')
+    assert len(client.get('/api/solutions/trending', query_string={'limit': -5}).get_json()) == 1
+
+
+def test_other_processes_views_are_pulled_once(solutions, monkeypatch):
+    client = app.test_client()
+    client.post(f'/api/solution/{solutions[0]}/view')
+    local = score(solutions[0])
+    with app.app_context():
+        # Another worker's view: in the log, not in this process's ranking.
+        db.session.add(EngagementEvent(solution_id=solutions[1], kind='view'))
+        db.session.commit()
+        assert score(solutions[1]) == 0
+        monkeypatch.setattr(app_module, '_trending_synced_at',
+                            app_module._trending_synced_at - TRENDING_SYNC_INTERVAL)
+        ensure_trending()
+    assert score(solutions[1]) == pytest.approx(local, rel=1e-3)
+    assert score(solutions[0]) == pytest.approx(local, rel=1e-3)
+
+
+def test_compaction_leaves_unsettled_events_for_pulls(solutions):
+    with app.app_context():
+        old = datetime.utcnow() - timedelta(seconds=app_module.ENGAGEMENT_SETTLE + 60)
+        db.session.add_all([
+            EngagementEvent(solution_id=solutions[0], kind='view', created_at=old),
+            EngagementEvent(solution_id=solutions[0], kind='view'),
+        ])
+        db.session.commit()
+        assert compact_engagement() >= 1
+        remaining = EngagementEvent.query.filter_by(solution_id=solutions[0]).all()
+        assert [e.created_at > old for e in remaining] == [True]
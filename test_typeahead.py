@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Search-as-you-type tests: prefix matching and keeping the index in step with writes.
+"""
+
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import pytest
+
+from app import app, db, CacheVersion, Job, sync_shared_caches
+from typeahead import PrefixIndex
+
+
+def test_lookup_matches_word_boundaries_and_dedupes():
+    index = PrefixIndex()
+    index.load([('ml', ['Machine Learning Fundamentals', 'Machine Learning']), ('web', ['Web Apps'])])
+    assert index.lookup('learn') == ['ml']
+    assert index.lookup('MACHINE  learning!') == ['ml']
+    assert index.lookup('') == []
+
+
+def test_add_respects_the_memory_cap():
+    index = PrefixIndex(max_entries=3)
+    assert index.add('a', ['one two three'])
+    assert not index.add('b', ['four'])
+    assert index.truncated and index.lookup('four') == []
+
+
+@pytest.fixture
+def job():
+    with app.app_context():
+        row = Job(title='Typeahead Wrangler', company='Prefixco', location='Remote',
+                  job_type='Full-time', description='d')
+        db.session.add(row)
+        db.session.commit()
+        yield row.id
+        Job.query.filter_by(id=row.id).delete()
+        db.session.commit()
+
+
+def suggest(query):
+    return [item['id'] for item in app.test_client().get('/api/suggest', query_string={'q': query}).get_json()]
+
+
+def test_suggestions_follow_inserts_edits_and_deletes(job):
+    assert job in suggest('wrangler')
+    with app.app_context():
+        db.session.get(Job, job).title = 'Typeahead Herder'
+        db.session.commit()
+    assert job not in suggest('wrangler')
+    assert job in suggest('herder')
+
+
+def test_write_in_another_process_rebuilds_the_index(job):
+    suggest('typeahead')  # loaded
+    with app.app_context():
+        # Another worker renames the job: no local hook runs, only the version moves.
+        db.session.execute(db.update(Job).where(Job.id == job).values(title='Typeahead Shepherd'))
+        db.session.commit()
+        db.session.execute(db.update(CacheVersion).where(CacheVersion.name == 'suggest')
+                           .values(version=CacheVersion.version + 1))
+        db.session.commit()
+        sync_shared_caches(force=True)
+    assert job in suggest('shepherd')
@@ -0,0 +1,74 @@
+"""
+Incrementally maintained, exponentially time-decayed popularity ranking.
+
+Scores are stored in log space relative to a fixed epoch. Decay multiplies
+every score by the same factor, so it never reorders items and only the item
+being recorded needs to move in the sorted ranking.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+
+
+def _logaddexp(a, b):
+    if a == -math.inf:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+class TrendingRanking:
+    """Top-K ranking of items by time-decayed engagement.
+
+    Each ``record(item_id, weight, at)`` adds ``weight`` to the item's score,
+    which then halves every ``half_life`` seconds.
+    """
+
+    def __init__(self, half_life=86400, epoch=None):
+        self.rate = math.log(2) / half_life
+        self.epoch = time.time() if epoch is None else epoch
+        self._scores = {}
+        self._ranking = []  # sorted (-log_score, item_id)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _log_weight(self, weight, at):
+        return math.log(weight) + self.rate * (at - self.epoch)
+
+    def load(self, events):
+        """Bulk-build from ``(item_id, weight, at)`` tuples, replacing existing scores."""
+        scores = {}
+        for item_id, weight, at in events:
+            if weight > 0:
+                scores[item_id] = _logaddexp(scores.get(item_id, -math.inf), self._log_weight(weight, at))
+        with self._lock:
+            self._scores = scores
+            self._ranking = sorted((-score, item_id) for item_id, score in scores.items())
+
+    def record(self, item_id, weight=1.0, at=None):
+        at = time.time() if at is None else at
+        with self._lock:
+            old = self._scores.get(item_id)
+            if old is not None:
+                del self._ranking[bisect_left(self._ranking, (-old, item_id))]
+            new = _logaddexp(-math.inf if old is None else old, self._log_weight(weight, at))
+            self._scores[item_id] = new
+            insort(self._ranking, (-new, item_id))
+
+    def discard(self, item_id):
+        with self._lock:
+            old = self._scores.pop(item_id, None)
+            if old is not None:
+                del self._ranking[bisect_left(self._ranking, (-old, item_id))]
+
+    def top(self, k=10, now=None):
+        """Return ``[(item_id, score)]`` for the ``k`` highest scores, decayed to ``now``."""
+        now = time.time() if now is None else now
+        offset = self.rate * (now - self.epoch)
+        with self._lock:
+            head = self._ranking[:k]
+        return [(item_id, math.exp(-neg_score - offset)) for neg_score, item_id in head]
@@ -0,0 +1,90 @@
+"""
+In-memory prefix index for search-as-you-type suggestions.
+Keys are kept in a sorted list so a lookup is a bisect plus a short scan.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Lowercase and collapse punctuation/whitespace so prefixes compare cleanly."""
+    return ' '.join(_WORD.findall((text or '').casefold()))
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over short labels.
+
+    Every label is indexed from each of its first ``max_words`` word
+    boundaries, so "learning" matches "Machine Learning Fundamentals".
+    Once ``max_entries`` keys are stored, further adds are dropped.
+    """
+
+    def __init__(self, max_entries=500000, max_words=6):
+        self.max_entries = max_entries
+        self.max_words = max_words
+        self.truncated = False
+        self._keys = []
+        self._values = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _expand(self, texts):
+        keys = set()
+        for text in texts:
+            words = normalize(text).split()
+            for i in range(min(len(words), self.max_words)):
+                keys.add(' '.join(words[i:]))
+        return keys
+
+    def load(self, items):
+        """Bulk-build from ``(value, texts)`` pairs, replacing any existing contents."""
+        pairs = []
+        truncated = False
+        for value, texts in items:
+            keys = self._expand(texts)
+            if len(pairs) + len(keys) > self.max_entries:
+                truncated = True
+                break
+            pairs.extend((key, value) for key in keys)
+        pairs.sort(key=lambda pair: pair[0])
+        with self._lock:
+            self._keys = [key for key, _ in pairs]
+            self._values = [value for _, value in pairs]
+            self.truncated = truncated
+
+    def add(self, value, texts):
+        """Insert one item; returns False if the memory cap was reached."""
+        keys = self._expand(texts)
+        with self._lock:
+            if len(self._keys) + len(keys) > self.max_entries:
+                self.truncated = True
+                return False
+            for key in keys:
+                i = bisect_left(self._keys, key)
+                self._keys.insert(i, key)
+                self._values.insert(i, value)
+        return True
+
+    def lookup(self, prefix, limit=10):
+        """Return up to ``limit`` distinct values whose labels start with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        with self._lock:
+            keys, values = self._keys, self._values
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(results) < limit and keys[i].startswith(prefix):
+                value = values[i]
+                if value not in seen:
+                    seen.add(value)
+                    results.append(value)
+                i += 1
+        return results